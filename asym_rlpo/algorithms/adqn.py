@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+
 import torch
 import torch.nn as nn
 
 from asym_rlpo.algorithms.algorithm import ValueBasedAlgorithm
-from asym_rlpo.algorithms.losses import dqn_loss_all_values, dqn_loss_bootstrap
+from asym_rlpo.algorithms.losses import (
+    dqn_bootstrap_targets,
+    dqn_loss_all_values,
+    dqn_loss_bootstrap,
+    dqn_loss_targets,
+)
 from asym_rlpo.algorithms.trainer import Trainer
 from asym_rlpo.data import Episode
 from asym_rlpo.models.qmodel import QhaModel, QhzaModel
 from asym_rlpo.types import LossDict
+from asym_rlpo.utils.aggregate import average_losses
 
 
 class ADQN(ValueBasedAlgorithm):
@@ -44,51 +52,84 @@ class ADQN(ValueBasedAlgorithm):
             (self.target_qhza_model, self.qhza_model),
         ]
 
-    def compute_losses(self, episode: Episode, *, discount: float) -> LossDict:
-        qha_values = self.qha_model.values(episode)
-        qhza_values = self.qhza_model.values(episode)
-
-        with torch.no_grad():
-            target_qha_values = self.target_qha_model.values(episode)
-            target_qhza_values = self.target_qhza_model.values(episode)
+    def compute_bootstrap_targets(
+        self,
+        episodes: Sequence[Episode],
+        *,
+        discount: float,
+    ) -> list[torch.Tensor]:
+        target_qha_values = self.target_qha_model.batch_values(episodes)
+        target_qhza_values = self.target_qhza_model.batch_values(episodes)
 
-        return {
-            'qha': dqn_loss_bootstrap(
-                qha_values,
-                episode.actions,
-                episode.rewards,
-                discount,
-                target_qhza_values,
-                target_qha_values,
-            ),
-            'qhza': dqn_loss_bootstrap(
-                qhza_values,
-                episode.actions,
+        return [
+            dqn_bootstrap_targets(
                 episode.rewards,
                 discount,
-                target_qhza_values,
-                target_qha_values,
-            ),
-        }
+                target_qhza_values[i],
+                target_qha_values[i],
+            )
+            for i, episode in enumerate(episodes)
+        ]
+
+    def compute_losses(
+        self,
+        episodes: Sequence[Episode],
+        *,
+        discount: float,
+    ) -> LossDict:
+        qha_values = self.qha_model.batch_values(episodes)
+        qhza_values = self.qhza_model.batch_values(episodes)
+
+        # both models regress onto the same bootstrap targets
+        with torch.no_grad():
+            targets = self.cached_bootstrap_targets(episodes, discount=discount)
+
+        return average_losses(
+            [
+                {
+                    'qha': dqn_loss_targets(
+                        qha_values[i],
+                        episode.action_indices,
+                        targets[i],
+                    ),
+                    'qhza': dqn_loss_targets(
+                        qhza_values[i],
+                        episode.action_indices,
+                        targets[i],
+                    ),
+                }
+                for i, episode in enumerate(episodes)
+            ]
+        )
 
 
 class ADQN_VarianceReduced(ADQN):
-    def compute_losses(self, episode: Episode, *, discount: float) -> LossDict:
-        qha_values = self.qha_model.values(episode)
-        qhza_values = self.qhza_model.values(episode)
+    def compute_losses(
+        self,
+        episodes: Sequence[Episode],
+        *,
+        discount: float,
+    ) -> LossDict:
+        qha_values = self.qha_model.batch_values(episodes)
+        qhza_values = self.qhza_model.batch_values(episodes)
 
         with torch.no_grad():
-            target_qha_values = self.target_qha_model.values(episode)
-            target_qhza_values = self.target_qhza_model.values(episode)
-
-        return {
-            'qha': dqn_loss_all_values(qha_values, target_qhza_values),
-            'qhza': dqn_loss_bootstrap(
-                qhza_values,
-                episode.actions,
-                episode.rewards,
-                discount,
-                target_qhza_values,
-                target_qha_values,
-            ),
-        }
+            target_qha_values = self.target_qha_model.batch_values(episodes)
+            target_qhza_values = self.target_qhza_model.batch_values(episodes)
+
+        return average_losses(
+            [
+                {
+                    'qha': dqn_loss_all_values(qha_values[i], target_qhza_values[i]),
+                    'qhza': dqn_loss_bootstrap(
+                        qhza_values[i],
+                        episode.action_indices,
+                        episode.rewards,
+                        discount,
+                        target_qhza_values[i],
+                        target_qha_values[i],
+                    ),
+                }
+                for i, episode in enumerate(episodes)
+            ]
+        )
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+
 import torch
 import torch.nn as nn
 
 from asym_rlpo.algorithms.algorithm import ValueBasedAlgorithm
-from asym_rlpo.algorithms.losses import dqn_loss_all_values, dqn_loss_bootstrap
+from asym_rlpo.algorithms.losses import (
+    dqn_bootstrap_targets,
+    dqn_loss_all_values,
+    dqn_loss_bootstrap,
+    dqn_loss_targets,
+)
 from asym_rlpo.algorithms.trainer import Trainer
 from asym_rlpo.data import Episode
 from asym_rlpo.models.qmodel import QhaModel, QzaModel
 from asym_rlpo.types import LossDict
+from asym_rlpo.utils.aggregate import average_losses
 
 
 class ADQN_State(ValueBasedAlgorithm):
@@ -44,51 +52,84 @@ class ADQN_State(ValueBasedAlgorithm):
             (self.target_qza_model, self.qza_model),
         ]
 
-    def compute_losses(self, episode: Episode, *, discount: float) -> LossDict:
-        qha_values = self.qha_model.values(episode)
-        qza_values = self.qza_model.values(episode)
-
-        with torch.no_grad():
-            target_qha_values = self.target_qha_model.values(episode)
-            target_qza_values = self.target_qza_model.values(episode)
+    def compute_bootstrap_targets(
+        self,
+        episodes: Sequence[Episode],
+        *,
+        discount: float,
+    ) -> list[torch.Tensor]:
+        target_qha_values = self.target_qha_model.batch_values(episodes)
+        target_qza_values = self.target_qza_model.batch_values(episodes)
 
-        return {
-            'qha': dqn_loss_bootstrap(
-                qha_values,
-                episode.actions,
-                episode.rewards,
-                discount,
-                target_qza_values,
-                target_qha_values,
-            ),
-            'qza': dqn_loss_bootstrap(
-                qza_values,
-                episode.actions,
+        return [
+            dqn_bootstrap_targets(
                 episode.rewards,
                 discount,
-                target_qza_values,
-                target_qha_values,
-            ),
-        }
+                target_qza_values[i],
+                target_qha_values[i],
+            )
+            for i, episode in enumerate(episodes)
+        ]
+
+    def compute_losses(
+        self,
+        episodes: Sequence[Episode],
+        *,
+        discount: float,
+    ) -> LossDict:
+        qha_values = self.qha_model.batch_values(episodes)
+        qza_values = self.qza_model.batch_values(episodes)
+
+        # both models regress onto the same bootstrap targets
+        with torch.no_grad():
+            targets = self.cached_bootstrap_targets(episodes, discount=discount)
+
+        return average_losses(
+            [
+                {
+                    'qha': dqn_loss_targets(
+                        qha_values[i],
+                        episode.action_indices,
+                        targets[i],
+                    ),
+                    'qza': dqn_loss_targets(
+                        qza_values[i],
+                        episode.action_indices,
+                        targets[i],
+                    ),
+                }
+                for i, episode in enumerate(episodes)
+            ]
+        )
 
 
 class ADQN_State_VarianceReduced(ADQN_State):
-    def compute_losses(self, episode: Episode, *, discount: float) -> LossDict:
-        qha_values = self.qha_model.values(episode)
-        qza_values = self.qza_model.values(episode)
+    def compute_losses(
+        self,
+        episodes: Sequence[Episode],
+        *,
+        discount: float,
+    ) -> LossDict:
+        qha_values = self.qha_model.batch_values(episodes)
+        qza_values = self.qza_model.batch_values(episodes)
 
         with torch.no_grad():
-            target_qha_values = self.target_qha_model.values(episode)
-            target_qza_values = self.target_qza_model.values(episode)
-
-        return {
-            'qha': dqn_loss_all_values(qha_values, target_qza_values),
-            'qza': dqn_loss_bootstrap(
-                qza_values,
-                episode.actions,
-                episode.rewards,
-                discount,
-                target_qza_values,
-                target_qha_values,
-            ),
-        }
+            target_qha_values = self.target_qha_model.batch_values(episodes)
+            target_qza_values = self.target_qza_model.batch_values(episodes)
+
+        return average_losses(
+            [
+                {
+                    'qha': dqn_loss_all_values(qha_values[i], target_qza_values[i]),
+                    'qza': dqn_loss_bootstrap(
+                        qza_values[i],
+                        episode.action_indices,
+                        episode.rewards,
+                        discount,
+                        target_qza_values[i],
+                        target_qha_values[i],
+                    ),
+                }
+                for i, episode in enumerate(episodes)
+            ]
+        )
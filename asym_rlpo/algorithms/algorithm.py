@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import abc
+from collections.abc import Sequence
 
+import torch
 import torch.nn as nn
 
 from asym_rlpo.algorithms.trainer import Trainer
@@ -27,6 +29,12 @@ class Algorithm(metaclass=abc.ABCMeta):
         self.models.load_state_dict(state_dict['models'])
         self.trainer.load_state_dict(state_dict['trainer'])
 
+    def online_models(self) -> nn.ModuleDict:
+        """trained models, i.e., excluding target models"""
+        return nn.ModuleDict(
+            {k: m for k, m in self.models.items() if not k.startswith('target_')}
+        )
+
     @abc.abstractmethod
     def target_pairs(self) -> list[TargetPair]:
         assert False
@@ -35,6 +43,53 @@ class Algorithm(metaclass=abc.ABCMeta):
 class ValueBasedAlgorithm(Algorithm):
     qha_model: QhaModel
 
+    def __init__(self, models: nn.ModuleDict, trainer: Trainer):
+        super().__init__(models, trainer)
+        self.target_version = 0
+
+    def invalidate_targets(self):
+        """marks cached bootstrap targets as stale after a target update"""
+        self.target_version += 1
+
+    @abc.abstractmethod
+    def compute_bootstrap_targets(
+        self,
+        episodes: Sequence[Episode],
+        *,
+        discount: float,
+    ) -> list[torch.Tensor]:
+        """computes the bootstrap targets of a batch of episodes"""
+        assert False
+
+    def cached_bootstrap_targets(
+        self,
+        episodes: Sequence[Episode],
+        *,
+        discount: float,
+    ) -> list[torch.Tensor]:
+        """returns bootstrap targets, reused until the next target update"""
+        # NOTE:  targets only depend on the (frozen) target models, so they are
+        # computed once per episode and target update
+        key = (self.target_version, discount)
+        missing = [
+            episode
+            for episode in episodes
+            if episode.cache.get('bootstrap_targets_key') != key
+        ]
+        if missing:
+            targets = self.compute_bootstrap_targets(missing, discount=discount)
+            for episode, episode_targets in zip(missing, targets):
+                episode.cache['bootstrap_targets_key'] = key
+                episode.cache['bootstrap_targets'] = episode_targets
+
+        return [episode.cache['bootstrap_targets'] for episode in episodes]
+
     @abc.abstractmethod
-    def compute_losses(self, episode: Episode, *, discount: float) -> LossDict:
+    def compute_losses(
+        self,
+        episodes: Sequence[Episode],
+        *,
+        discount: float,
+    ) -> LossDict:
+        """computes losses averaged over a batch of episodes"""
         assert False
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+
 import torch
 import torch.nn as nn
 
 from asym_rlpo.algorithms.algorithm import ValueBasedAlgorithm
-from asym_rlpo.algorithms.losses import dqn_loss_action_values
+from asym_rlpo.algorithms.losses import dqn_bootstrap_targets, dqn_loss_targets
 from asym_rlpo.algorithms.trainer import Trainer
 from asym_rlpo.data import Episode
 from asym_rlpo.models.qmodel import QhaModel
 from asym_rlpo.types import LossDict
+from asym_rlpo.utils.aggregate import average_losses
 
 
 class DQN(ValueBasedAlgorithm):
@@ -33,18 +36,44 @@ class DQN(ValueBasedAlgorithm):
     def target_pairs(self) -> list[tuple[QhaModel, QhaModel]]:
         return [(self.target_qha_model, self.qha_model)]
 
-    def compute_losses(self, episode: Episode, *, discount: float) -> LossDict:
-        qha_values = self.qha_model.values(episode)
-
-        with torch.no_grad():
-            target_qha_values = self.target_qha_model.values(episode)
+    def compute_bootstrap_targets(
+        self,
+        episodes: Sequence[Episode],
+        *,
+        discount: float,
+    ) -> list[torch.Tensor]:
+        target_qha_values = self.target_qha_model.batch_values(episodes)
 
-        return {
-            'qha': dqn_loss_action_values(
-                qha_values,
-                episode.actions,
+        return [
+            dqn_bootstrap_targets(
                 episode.rewards,
                 discount,
-                target_qha_values,
+                target_qha_values[i],
+                target_qha_values[i],
             )
-        }
+            for i, episode in enumerate(episodes)
+        ]
+
+    def compute_losses(
+        self,
+        episodes: Sequence[Episode],
+        *,
+        discount: float,
+    ) -> LossDict:
+        qha_values = self.qha_model.batch_values(episodes)
+
+        with torch.no_grad():
+            targets = self.cached_bootstrap_targets(episodes, discount=discount)
+
+        return average_losses(
+            [
+                {
+                    'qha': dqn_loss_targets(
+                        qha_values[i],
+                        episode.action_indices,
+                        targets[i],
+                    )
+                }
+                for i, episode in enumerate(episodes)
+            ]
+        )
@@ -3,15 +3,18 @@ from __future__ import annotations
 import torch
 import torch.nn.functional as F
 
+from asym_rlpo.q_estimators import Q_Estimator
+from asym_rlpo.types import LossDict
+
 
 def dqn_loss_action_values(
     values: torch.Tensor,
-    actions: torch.Tensor,
+    action_indices: torch.Tensor,
     rewards: torch.Tensor,
     discount: float,
     target_values: torch.Tensor,
 ) -> torch.Tensor:
-    values = values.gather(1, actions.unsqueeze(-1)).squeeze(-1)
+    values = values.gather(1, action_indices).squeeze(-1)
     next_values = target_values.max(-1).values.roll(-1, 0)
     next_values[-1] = 0.0
 
@@ -25,20 +28,82 @@ def dqn_loss_all_values(
     return F.mse_loss(values, target_values)
 
 
+def dqn_loss_targets(
+    values: torch.Tensor,
+    action_indices: torch.Tensor,
+    targets: torch.Tensor,
+) -> torch.Tensor:
+    values = values.gather(1, action_indices).squeeze(-1)
+    return F.mse_loss(values, targets)
+
+
+# NOTE:  scripted so that the chain of small gather/shift/pointwise ops can be
+# fused;  the shift is a cat rather than a roll followed by an in-place write
+@torch.jit.script
+def dqn_bootstrap_targets(
+    rewards: torch.Tensor,
+    discount: float,
+    target_values: torch.Tensor,
+    target_action_selector: torch.Tensor,
+) -> torch.Tensor:
+    next_actions = target_action_selector.argmax(-1, keepdim=True)
+    next_values = target_values.gather(1, next_actions).squeeze(-1)
+    next_values = torch.cat([next_values[1:], next_values.new_zeros(1)])
+
+    return rewards + discount * next_values
+
+
 def dqn_loss_bootstrap(
     values: torch.Tensor,
-    actions: torch.Tensor,
+    action_indices: torch.Tensor,
     rewards: torch.Tensor,
     discount: float,
     target_values: torch.Tensor,
     target_action_selector: torch.Tensor,
 ) -> torch.Tensor:
-    values = values.gather(1, actions.unsqueeze(-1)).squeeze(-1)
-    next_values = (
-        target_values.gather(1, target_action_selector.argmax(-1).unsqueeze(-1))
-        .squeeze(-1)
-        .roll(-1, 0)
+    targets = dqn_bootstrap_targets(
+        rewards,
+        discount,
+        target_values,
+        target_action_selector,
     )
-    next_values[-1] = 0.0
+    return dqn_loss_targets(values, action_indices, targets)
 
-    return F.mse_loss(values, rewards + discount * next_values)
+
+def a2c_losses(
+    action_logits: torch.Tensor,
+    action_indices: torch.Tensor,
+    rewards: torch.Tensor,
+    v_values: torch.Tensor,
+    target_v_values: torch.Tensor,
+    *,
+    discount: float,
+    q_estimator: Q_Estimator,
+) -> LossDict:
+    # NOTE:  bootstrap targets are computed in full precision, even when the
+    # values themselves were computed under mixed-precision autocast
+    with torch.no_grad(), torch.autocast(rewards.device.type, enabled=False):
+        v_values_ = v_values.detach().float()
+        q_values = q_estimator(rewards, v_values_, discount=discount)
+        advantages = q_values - v_values_
+        target_q_values = q_estimator(
+            rewards, target_v_values.float(), discount=discount
+        )
+
+    # policy loss
+    discounts = discount ** torch.arange(rewards.size(0), device=rewards.device)
+    action_nlls = -action_logits.gather(1, action_indices).squeeze(-1)
+    policy_loss = (discounts * advantages * action_nlls).sum()
+
+    # negentropy loss
+    action_dists = torch.distributions.Categorical(logits=action_logits)
+    negentropy_loss = -action_dists.entropy().sum()
+
+    # critic loss
+    critic_loss = F.mse_loss(v_values, target_q_values, reduction='sum')
+
+    return {
+        'policy': policy_loss,
+        'negentropy': negentropy_loss,
+        'critic': critic_loss,
+    }
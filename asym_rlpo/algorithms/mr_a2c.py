@@ -1,16 +1,19 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+
 import torch
 import torch.nn as nn
-import torch.nn.functional as F
 
 from asym_rlpo.algorithms.algorithm import Algorithm
+from asym_rlpo.algorithms.losses import a2c_losses
 from asym_rlpo.algorithms.trainer import Trainer
 from asym_rlpo.data import Episode
 from asym_rlpo.models.actor_critic import MemoryReactive_ActorCriticModel
 from asym_rlpo.models.critic import HM_CriticModel
 from asym_rlpo.q_estimators import Q_Estimator
 from asym_rlpo.types import LossDict
+from asym_rlpo.utils.aggregate import average_losses
 
 
 class MemoryReactive_A2C(Algorithm):
@@ -41,46 +44,34 @@ class MemoryReactive_A2C(Algorithm):
 
     def compute_losses(
         self,
-        episode: Episode,
+        episodes: Sequence[Episode],
         *,
         discount: float,
         q_estimator: Q_Estimator,
     ) -> LossDict:
-        action_logits = self.actor_critic_model.actor_model.action_logits(episode)
-        v_values = self.actor_critic_model.critic_model.values(episode)
-        device = action_logits.device
+        """computes losses averaged over a batch of episodes"""
+        actor_model = self.actor_critic_model.actor_model
+        critic_model = self.actor_critic_model.critic_model
+        action_logits = actor_model.batch_action_logits(episodes)
+        v_values = critic_model.batch_values(episodes)
 
         with torch.no_grad():
-            q_values = q_estimator(
-                episode.rewards,
-                v_values.detach(),
-                discount=discount,
-            )
-            advantages = q_values - v_values
-
-            target_v_values = self.target_critic_model.max_memory_values(episode)
-            target_q_values = q_estimator(
-                episode.rewards,
-                target_v_values,
-                discount=discount,
-            )
+            target_v_values = [
+                self.target_critic_model.max_memory_values(episode)
+                for episode in episodes
+            ]
 
-        # policy loss
-        discounts = discount ** torch.arange(len(episode), device=device)
-        action_nlls = -action_logits.gather(1, episode.actions.unsqueeze(-1)).squeeze(
-            -1
+        return average_losses(
+            [
+                a2c_losses(
+                    action_logits[i],
+                    episode.action_indices,
+                    episode.rewards,
+                    v_values[i],
+                    target_v_values[i],
+                    discount=discount,
+                    q_estimator=q_estimator,
+                )
+                for i, episode in enumerate(episodes)
+            ]
         )
-        policy_loss = (discounts * advantages * action_nlls).sum()
-
-        # negentropy loss
-        action_dists = torch.distributions.Categorical(logits=action_logits)
-        negentropy_loss = -action_dists.entropy().sum()
-
-        # critic loss
-        critic_loss = F.mse_loss(v_values, target_q_values, reduction='sum')
-
-        return {
-            'policy': policy_loss,
-            'negentropy': negentropy_loss,
-            'critic': critic_loss,
-        }
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import torch
 from torch.nn.utils.clip_grad import clip_grad_norm_
 
 from asym_rlpo.types import (
@@ -9,6 +10,7 @@ from asym_rlpo.types import (
     OptimizerFactory,
     ParametersGeneratorsDict,
 )
+from asym_rlpo.utils.distributed import all_reduce_gradients
 
 
 class Trainer:
@@ -23,6 +25,8 @@ class Trainer:
         self.optimizers = optimizers
         self.parameters_generators = parameters_generators
         self.max_gradient_norm = max_gradient_norm
+        # NOTE:  set for fp16 mixed-precision training
+        self.grad_scaler: torch.amp.GradScaler | None = None
 
     @staticmethod
     def from_factories(
@@ -58,14 +62,27 @@ class Trainer:
 
         for k, optimizer in self.optimizers.items():
             parameters_generator = self.parameters_generators[k]
-            parameters = parameters_generator()
+            parameters = list(parameters_generator())
 
             optimizer.zero_grad()
-            losses[k].backward()
+            if self.grad_scaler is None:
+                losses[k].backward()
+            else:
+                self.grad_scaler.scale(losses[k]).backward()
+            all_reduce_gradients(parameters)
+            if self.grad_scaler is not None:
+                # gradients are clipped (and their norms reported) unscaled
+                self.grad_scaler.unscale_(optimizer)
             gradient_norms[k] = clip_grad_norm_(
                 parameters,
                 max_norm=self.max_gradient_norm,
             )
-            optimizer.step()
+            if self.grad_scaler is None:
+                optimizer.step()
+            else:
+                self.grad_scaler.step(optimizer)
+
+        if self.grad_scaler is not None:
+            self.grad_scaler.update()
 
         return gradient_norms
@@ -5,6 +5,7 @@ import random
 from collections import deque
 from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Generic, Protocol, TypeVar
 
 import numpy as np
@@ -12,7 +13,7 @@ import torch
 
 import asym_rlpo.generalized_torch as gtorch
 from asym_rlpo.utils.collate import collate_numpy
-from asym_rlpo.utils.convert import numpy2torch
+from asym_rlpo.utils.convert import is_dtype_floating, numpy2torch
 
 logger = logging.getLogger(__name__)
 
@@ -63,16 +64,33 @@ class Episode(Generic[Observation, Latent]):
         actions,
         rewards,
         info: dict,
+        cache: dict | None = None,
     ):
         self.observations: Observation = observations
         self.latents: Latent = latents
         self.actions = actions
         self.rewards = rewards
         self.info = info
+        # derived training data, shared with device copies of this episode
+        self.cache: dict = {} if cache is None else cache
+
+    def __getstate__(self):
+        # cached training data is not persisted
+        return {**self.__dict__, 'cache': {}}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # NOTE:  checkpoints from before caching lack the cache
+        self.__dict__.setdefault('cache', {})
 
     def __len__(self):
         return len(self.actions)
 
+    @cached_property
+    def action_indices(self) -> torch.Tensor:
+        """actions shaped as a gather index, reused across training steps"""
+        return self.actions.unsqueeze(-1)
+
     def __getitem__(self, index) -> Interaction[Observation, Latent]:
         return Interaction(
             observation=(
@@ -135,19 +153,60 @@ class Episode(Generic[Observation, Latent]):
             info=numpy2torch(self.info),
         )
 
-    def to(self, device: torch.device) -> Episode[Observation, Latent]:
+    def to(
+        self,
+        device: torch.device,
+        *,
+        non_blocking: bool = False,
+    ) -> Episode[Observation, Latent]:
+        return Episode(
+            observations=gtorch.to(
+                self.observations, device, non_blocking=non_blocking
+            ),
+            latents=gtorch.to(self.latents, device, non_blocking=non_blocking),
+            actions=gtorch.to(self.actions, device, non_blocking=non_blocking),
+            rewards=gtorch.to(self.rewards, device, non_blocking=non_blocking),
+            info=gtorch.to(self.info, device, non_blocking=non_blocking),
+            cache=self.cache,
+        )
+
+    def pin_memory(self) -> Episode[Observation, Latent]:
         return Episode(
-            observations=gtorch.to(self.observations, device),
-            latents=gtorch.to(self.latents, device),
-            actions=gtorch.to(self.actions, device),
-            rewards=gtorch.to(self.rewards, device),
-            info=gtorch.to(self.info, device),
+            observations=gtorch.pin_memory(self.observations),
+            latents=gtorch.pin_memory(self.latents),
+            actions=gtorch.pin_memory(self.actions),
+            rewards=gtorch.pin_memory(self.rewards),
+            info=gtorch.pin_memory(self.info),
+            cache=self.cache,
         )
 
 
+def split_episodes(
+    features: torch.Tensor,
+    episodes: Sequence[Episode],
+) -> list[torch.Tensor]:
+    """splits timestep-concatenated features into per-episode features"""
+    return list(features.split([len(episode) for episode in episodes]))
+
+
+def _single_precision(data):
+    """casts floating arrays to float32, as done anyway by `numpy2torch`"""
+
+    if isinstance(data, dict):
+        return {k: _single_precision(v) for k, v in data.items()}
+
+    return data.astype(np.float32, copy=False) if is_dtype_floating(data) else data
+
+
 class EpisodeBuilder(Generic[Observation, Latent]):
+    """accumulates interactions field by field, i.e., as a structure of arrays"""
+
     def __init__(self):
-        self.interactions: list[Interaction[Observation, Latent]] = []
+        self.observations: list[Observation] = []
+        self.latents: list[Latent] = []
+        self.actions: list[int] = []
+        self.rewards: list[float] = []
+        self.infos: list[dict] = []
         self.done = False
 
     def append(
@@ -155,21 +214,129 @@ class EpisodeBuilder(Generic[Observation, Latent]):
         interaction: Interaction[Observation, Latent],
         done: bool,
     ):
-        self.interactions.append(interaction)
+        self.observations.append(interaction.observation)
+        self.latents.append(interaction.latent)
+        self.actions.append(interaction.action)
+        self.rewards.append(interaction.reward)
+        self.infos.append(interaction.info)
         self.done |= done
 
     def build(self) -> Episode[Observation, Latent]:
         if not self.done:
             raise RuntimeError('Cannot build incomplete episode')
 
-        return Episode.from_interactions(self.interactions)
+        # NOTE:  single precision makes the later `Episode.torch()` zero-copy;
+        # rewards stay double precision, since returns are computed from them
+        return Episode(
+            observations=_single_precision(collate_numpy(self.observations)),
+            latents=_single_precision(collate_numpy(self.latents)),
+            actions=collate_numpy(self.actions),
+            rewards=collate_numpy(self.rewards),
+            info=_single_precision(collate_numpy(self.infos)),
+        )
+
+
+class EpisodeStager:
+    """copies episodes to a cuda device through reusable page-locked buffers"""
+
+    def __init__(self, device: torch.device):
+        self.device = device
+        self.__buffers: dict[str, torch.Tensor] = {}
+        self.__event: torch.cuda.Event | None = None
+
+    def stage(self, episodes: Sequence[Episode]) -> list[Episode]:
+        """copies torch episodes with a single transfer per field"""
+
+        if self.__event is not None:
+            # NOTE:  buffers are overwritten only once previous copies are done
+            self.__event.synchronize()
+
+        observations = self._stage_field(
+            'observations', [episode.observations for episode in episodes]
+        )
+        latents = self._stage_field(
+            'latents', [episode.latents for episode in episodes]
+        )
+        actions = self._stage_field(
+            'actions', [episode.actions for episode in episodes]
+        )
+        rewards = self._stage_field(
+            'rewards', [episode.rewards for episode in episodes]
+        )
+        info = self._stage_field('info', [episode.info for episode in episodes])
+
+        self.__event = torch.cuda.Event()
+        self.__event.record()
+
+        return [
+            Episode(
+                observations=observations[i],
+                latents=latents[i],
+                actions=actions[i],
+                rewards=rewards[i],
+                info=info[i],
+                cache=episode.cache,
+            )
+            for i, episode in enumerate(episodes)
+        ]
+
+    def _stage_field(self, key: str, data: Sequence) -> list:
+        if isinstance(data[0], dict):
+            staged = {
+                k: self._stage_tensors(f'{key}/{k}', [d[k] for d in data])
+                for k in data[0].keys()
+            }
+            return [{k: v[i] for k, v in staged.items()} for i in range(len(data))]
+
+        return self._stage_tensors(key, data)
+
+    def _stage_tensors(
+        self,
+        key: str,
+        tensors: Sequence[torch.Tensor],
+    ) -> list[torch.Tensor]:
+        sizes = [tensor.numel() for tensor in tensors]
+        size = sum(sizes)
+
+        buffer = self.__buffers.get(key)
+        if buffer is None or buffer.dtype != tensors[0].dtype or len(buffer) < size:
+            buffer = torch.empty(size, dtype=tensors[0].dtype, pin_memory=True)
+            self.__buffers[key] = buffer
+
+        staging = buffer[:size]
+        torch.cat([tensor.flatten() for tensor in tensors], out=staging)
+        staged = staging.to(self.device, non_blocking=True)
+
+        return [
+            chunk.view(tensor.shape)
+            for chunk, tensor in zip(staged.split(sizes), tensors)
+        ]
 
 
 class EpisodeBuffer(Generic[Observation, Latent]):
-    def __init__(self, max_timesteps: int):
+    def __init__(
+        self,
+        max_timesteps: int,
+        *,
+        device: torch.device | None = None,
+        pin_memory: bool = False,
+    ):
         self.episodes = deque()
         self.__max_timesteps = max_timesteps
         self.__num_interactions = 0
+        # if given, episodes are moved to (and kept resident on) this device
+        self.__device = device
+        # otherwise, episodes may be kept in page-locked host memory to allow
+        # asynchronous host-to-device copies
+        self.__pin_memory = pin_memory
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # NOTE:  checkpoints from before device placement lack these settings
+        if '_EpisodeBuffer__device' not in state:
+            self.__device = None
+        if '_EpisodeBuffer__pin_memory' not in state:
+            self.__pin_memory = False
 
     def num_episodes(self) -> int:
         return len(self.episodes)
@@ -188,8 +355,20 @@ class EpisodeBuffer(Generic[Observation, Latent]):
 
         return max_timesteps_exceeded
 
+    def _store(
+        self,
+        episode: Episode[Observation, Latent],
+    ) -> Episode[Observation, Latent]:
+        if self.__device is not None:
+            return episode.to(self.__device)
+
+        if self.__pin_memory:
+            return episode.pin_memory()
+
+        return episode
+
     def append_episode(self, episode: Episode[Observation, Latent]) -> bool:
-        self.episodes.append(episode)
+        self.episodes.append(self._store(episode))
         self.__num_interactions += len(episode)
 
         return self._enforce_max_timesteps()
@@ -199,7 +378,7 @@ class EpisodeBuffer(Generic[Observation, Latent]):
         episodes: Sequence[Episode[Observation, Latent]],
     ) -> bool:
         for episode in episodes:
-            self.episodes.append(episode)
+            self.episodes.append(self._store(episode))
             self.__num_interactions += len(episode)
 
         return self._enforce_max_timesteps()
@@ -1,18 +1,42 @@
+import torch.nn as nn
 import wandb
 
 from .logger import DataLogger
 
 
 class WandbLogger(DataLogger):
+    """buffers uncommitted data, and logs each step with a single wandb call"""
+
     def __init__(self):
         super().__init__()
         self.__step = 0
+        self.__buffer = {}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # NOTE:  checkpoints from before buffering lack the buffer
+        self.__buffer = {}
 
     def log(self, data: dict, *, commit: bool = True):
-        wandb.log(data, step=self.__step, commit=commit)
+        self.__buffer.update(data)
         if commit:
-            self.__step += 1
+            self.commit()
 
     def commit(self):
-        wandb.log({}, step=self.__step)
+        wandb.log(self.__buffer, step=self.__step)
+        self.__buffer = {}
         self.__step += 1
+
+
+def gradient_histograms(module: nn.Module) -> dict:
+    """gradient histograms, named as by `wandb.watch`"""
+
+    # NOTE:  computed on demand rather than by `wandb.watch` backward hooks,
+    # which would otherwise run on every backward pass
+    return {
+        f'gradients/{name}': wandb.Histogram(
+            parameter.grad.detach().float().cpu().numpy()
+        )
+        for name, parameter in module.named_parameters()
+        if parameter.grad is not None
+    }
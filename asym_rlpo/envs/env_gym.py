@@ -18,6 +18,14 @@ from asym_rlpo.envs.env import (
 )
 from asym_rlpo.envs.wrappers import IndexWrapper
 
+# env id patterns are compiled once, and matched in order
+_EXTRA_ENV_TYPES: list[tuple[re.Pattern, EnvironmentType]] = [
+    (re.compile(r'extra-dectiger-v\d+'), EnvironmentType.EXTRA_DECTIGER),
+    (re.compile(r'extra-cleaner-v\d+'), EnvironmentType.EXTRA_CLEANER),
+    (re.compile(r'extra-car-flag-v\d+'), EnvironmentType.EXTRA_CARFLAG),
+]
+_PO_ENV_PATTERN = re.compile(r'^PO-([\w:.-]+)-([\w:.-]+)-v(\d+)$')
+
 
 def make_gym_env(id: str, *, latent_type: LatentType) -> Environment:
     """makes a stateful gym environment or converts a fully observable openai environment into a partially observable openai environment"""
@@ -40,14 +48,9 @@ def make_gym_env(id: str, *, latent_type: LatentType) -> Environment:
             if isinstance(gym_env.unwrapped, gym_pomdps.POMDP):
                 return GymEnvironment(gym_env, EnvironmentType.FLAT)
 
-            if re.fullmatch(r'extra-dectiger-v\d+', gym_env.spec.id):
-                return GymEnvironment(gym_env, EnvironmentType.EXTRA_DECTIGER)
-
-            if re.fullmatch(r'extra-cleaner-v\d+', gym_env.spec.id):
-                return GymEnvironment(gym_env, EnvironmentType.EXTRA_CLEANER)
-
-            if re.fullmatch(r'extra-car-flag-v\d+', gym_env.spec.id):
-                return GymEnvironment(gym_env, EnvironmentType.EXTRA_CARFLAG)
+            for pattern, env_type in _EXTRA_ENV_TYPES:
+                if pattern.fullmatch(gym_env.spec.id):
+                    return GymEnvironment(gym_env, env_type)
 
             return GymEnvironment(gym_env, EnvironmentType.OTHER)
 
@@ -55,8 +58,7 @@ def make_gym_env(id: str, *, latent_type: LatentType) -> Environment:
 def make_po_gym_env(name: str) -> Environment:
     """convert a fully observable openai environment into a partially observable openai environment"""
 
-    pattern = r'^PO-([\w:.-]+)-([\w:.-]+)-v(\d+)$'
-    m = re.match(pattern, name)
+    m = _PO_ENV_PATTERN.match(name)
     # m[0] is the full name
     # m[1] is the first capture, i.e., the type of partial observability
     # m[2] is the second capture, i.e., the name w/o the version
@@ -0,0 +1,103 @@
+import multiprocessing as mp
+from collections.abc import Callable, Mapping, Sequence
+from multiprocessing.connection import Connection
+
+import numpy as np
+
+from asym_rlpo.envs.env import Action, Environment, Latent, Observation
+
+EnvironmentFactory = Callable[[], Environment]
+Transition = tuple[Observation, Latent, float, bool]
+
+
+def _worker(connection: Connection, env_factory: EnvironmentFactory):
+    env = env_factory()
+
+    try:
+        while True:
+            command, data = connection.recv()
+
+            if command == 'seed':
+                env.seed(data)
+                connection.send(None)
+
+            elif command == 'reset':
+                connection.send(env.reset())
+
+            elif command == 'step':
+                connection.send(env.step(data))
+
+            elif command == 'close':
+                break
+
+            else:
+                raise ValueError(f'invalid command {command}')
+
+    finally:
+        connection.close()
+
+
+class SubprocEnvironments:
+    """independent environment copies, each stepped in its own worker process"""
+
+    def __init__(self, env_factories: Sequence[EnvironmentFactory]):
+        # NOTE:  spawn (rather than fork) to avoid inheriting cuda state
+        context = mp.get_context('spawn')
+
+        self._connections: list[Connection] = []
+        self._processes = []
+        for env_factory in env_factories:
+            connection, worker_connection = context.Pipe()
+            process = context.Process(
+                target=_worker,
+                args=(worker_connection, env_factory),
+                daemon=True,
+            )
+            process.start()
+            worker_connection.close()
+
+            self._connections.append(connection)
+            self._processes.append(process)
+
+    @property
+    def num_envs(self) -> int:
+        return len(self._connections)
+
+    def seed(self, seed: int | Sequence[int] | None = None):
+        """seeds each environment with its own child of `seed`'s sequence"""
+
+        # NOTE:  spawned seeds are independent of each other and of `seed`
+        # itself, unlike, e.g., consecutive offsets of `seed`
+        if seed is None:
+            seeds = [None] * self.num_envs
+        else:
+            seed_sequences = np.random.SeedSequence(seed).spawn(self.num_envs)
+            seeds = [int(ss.generate_state(1)[0]) for ss in seed_sequences]
+
+        for connection, seed_ in zip(self._connections, seeds):
+            connection.send(('seed', seed_))
+
+        for connection in self._connections:
+            connection.recv()
+
+    def reset(self, indices: Sequence[int]) -> list[tuple[Observation, Latent]]:
+        for i in indices:
+            self._connections[i].send(('reset', None))
+
+        return [self._connections[i].recv() for i in indices]
+
+    def step(self, actions: Mapping[int, Action]) -> dict[int, Transition]:
+        # all steps are dispatched before any result is awaited, so that the
+        # environments are stepped in parallel
+        for i, action in actions.items():
+            self._connections[i].send(('step', action))
+
+        return {i: self._connections[i].recv() for i in actions}
+
+    def close(self):
+        for connection in self._connections:
+            connection.send(('close', None))
+            connection.close()
+
+        for process in self._processes:
+            process.join()
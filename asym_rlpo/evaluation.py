@@ -4,7 +4,7 @@ from dataclasses import dataclass
 import numpy as np
 
 from asym_rlpo.data import Episode
-from asym_rlpo.utils.returns import returns
+from asym_rlpo.utils.returns import concatenated_returns
 
 
 @dataclass
@@ -29,12 +29,7 @@ def evaluate_returns(
     *,
     discount: float,
 ) -> np.ndarray:
-    rewards = [episode.rewards for episode in episodes]
-    tot_num_steps = max(len(rs) for rs in rewards)
-    rewards_array = np.vstack(
-        [
-            np.pad(r_array, (0, tot_num_steps - r_array.size))  # pad zeros to the right
-            for r_array in rewards
-        ]
-    )
-    return returns(rewards_array, discount)
+    # NOTE:  rewards are concatenated rather than padded to the longest episode
+    rewards = np.concatenate([episode.rewards for episode in episodes])
+    lengths = np.array([len(episode) for episode in episodes])
+    return concatenated_returns(rewards, lengths, discount)
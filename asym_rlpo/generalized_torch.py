@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from typing import TypeVar
 
 import torch
@@ -35,3 +36,15 @@ def unsqueeze(x: GTensor, *args, **kwargs) -> GTensor:
 
 def to(x: GTensor, *args, **kwargs) -> GTensor:
     return tensor_apply(x, 'to', *args, **kwargs)
+
+
+def pin_memory(x: GTensor) -> GTensor:
+    return tensor_apply(x, 'pin_memory')
+
+
+def cat(xs: Sequence[GTensor], *args, **kwargs) -> GTensor:
+    return (
+        {k: torch.cat([x[k] for x in xs], *args, **kwargs) for k in xs[0].keys()}
+        if isinstance(xs[0], dict)
+        else torch.cat(list(xs), *args, **kwargs)
+    )
@@ -1,6 +1,9 @@
+from collections.abc import Sequence
+
+import torch
 import torch.nn as nn
 
-from asym_rlpo.data import Episode
+from asym_rlpo.data import Episode, split_episodes
 from asym_rlpo.models.history import HistoryModel
 from asym_rlpo.models.types import PolicyModule
 from asym_rlpo.models.memory_reactive import MemoryReactiveHistoryModel
@@ -22,6 +25,11 @@ class ActorModel(nn.Module):
         history_features = self.history_model.episodic(episode)
         return self.policy_module(history_features)
 
+    def batch_action_logits(self, episodes: Sequence[Episode]) -> list[ActionLogits]:
+        history_features = torch.cat(self.history_model.batch_episodic(episodes))
+        action_logits = self.policy_module(history_features)
+        return split_episodes(action_logits, episodes)
+
     def policy_function(self) -> PolicyFunction:
         return self.policy_module
 
@@ -1,8 +1,10 @@
 import abc
+from collections.abc import Sequence
 
 import torch
 
-from asym_rlpo.data import Episode
+import asym_rlpo.generalized_torch as gtorch
+from asym_rlpo.data import Episode, split_episodes
 from asym_rlpo.models.history import HistoryModel
 from asym_rlpo.models.memory import MemoryModel
 from asym_rlpo.models.model import Model
@@ -19,6 +21,9 @@ class CriticModel(Model):
     def values(self, episode: Episode) -> Values:
         assert False
 
+    def batch_values(self, episodes: Sequence[Episode]) -> list[Values]:
+        return [self.values(episode) for episode in episodes]
+
 
 class H_CriticModel(CriticModel):
     def __init__(
@@ -34,6 +39,11 @@ class H_CriticModel(CriticModel):
         history_features = self.history_model.episodic(episode)
         return self.value_module(history_features).squeeze(-1)
 
+    def batch_values(self, episodes: Sequence[Episode]) -> list[Values]:
+        history_features = torch.cat(self.history_model.batch_episodic(episodes))
+        values = self.value_module(history_features).squeeze(-1)
+        return split_episodes(values, episodes)
+
 
 class Z_CriticModel(CriticModel):
     def __init__(
@@ -49,6 +59,12 @@ class Z_CriticModel(CriticModel):
         latent_features = self.latent_model(episode.latents)
         return self.value_module(latent_features).squeeze(-1)
 
+    def batch_values(self, episodes: Sequence[Episode]) -> list[Values]:
+        latents = gtorch.cat([episode.latents for episode in episodes])
+        latent_features = self.latent_model(latents)
+        values = self.value_module(latent_features).squeeze(-1)
+        return split_episodes(values, episodes)
+
 
 class HZ_CriticModel(CriticModel):
     def __init__(
@@ -68,6 +84,14 @@ class HZ_CriticModel(CriticModel):
         input_features = torch.cat([history_features, latent_features], dim=-1)
         return self.value_module(input_features).squeeze(-1)
 
+    def batch_values(self, episodes: Sequence[Episode]) -> list[Values]:
+        history_features = torch.cat(self.history_model.batch_episodic(episodes))
+        latents = gtorch.cat([episode.latents for episode in episodes])
+        latent_features = self.latent_model(latents)
+        input_features = torch.cat([history_features, latent_features], dim=-1)
+        values = self.value_module(input_features).squeeze(-1)
+        return split_episodes(values, episodes)
+
 
 class HM_CriticModel(CriticModel):
     def __init__(
@@ -24,5 +24,7 @@ class EmbeddingModel(FeatureModel):
         return self.embeddings(inputs)
 
     def zeros_like(self, device: torch.device | None = None):
-        features = self.embeddings(torch.tensor(0))
-        return torch.zeros_like(features, device=device)
+        if device is None:
+            return self.embeddings.weight.new_zeros(self.dim)
+
+        return torch.zeros(self.dim, device=device)
@@ -53,6 +53,7 @@ class CleanerModelFactory(ModelFactory):
             interaction_model,
             sequence_model,
             memory_size=self.history_model_memory_size,
+            checkpoint_bptt=self.checkpoint_bptt,
         )
 
     def make_policymodule(
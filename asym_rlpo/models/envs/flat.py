@@ -55,6 +55,7 @@ class FlatModelFactory(ModelFactory):
             interaction_model,
             sequence_model,
             memory_size=self.history_model_memory_size,
+            checkpoint_bptt=self.checkpoint_bptt,
         )
 
     def make_policymodule(
@@ -1,5 +1,7 @@
 import abc
 
+import torch
+
 from asym_rlpo.envs import Environment
 from asym_rlpo.models.actor import ActorModel
 from asym_rlpo.models.critic import (
@@ -28,6 +30,8 @@ class ModelFactory(metaclass=abc.ABCMeta):
         self.history_model: str
         self.attention_num_heads: int | None = None
         self.history_model_memory_size: int
+        self.jit_mlps: bool = False
+        self.checkpoint_bptt: bool = False
 
     @abc.abstractmethod
     def make_latent_model(self) -> FeatureModel:
@@ -110,15 +114,22 @@ class ModelFactory(metaclass=abc.ABCMeta):
 
         raise ValueError(f'invalid qmodel type `{qmodel_type}`')
 
+    def _script_qmodule(self, qmodule: QModule) -> QModule:
+        # NOTE:  only the feed-forward modules are scripted;  the sequence
+        # models are left as they are
+        return torch.jit.script(qmodule) if self.jit_mlps else qmodule
+
     def make_qha_model(self) -> QhaModel:
         history_model = self.make_history_model()
-        qmodule = self.make_ha_qmodule(history_model)
+        qmodule = self._script_qmodule(self.make_ha_qmodule(history_model))
         return QhaModel(self.env.action_space, history_model, qmodule)
 
     def make_qhza_model(self) -> QhzaModel:
         history_model = self.make_history_model()
         latent_model = self.make_latent_model()
-        qmodule = self.make_hza_qmodule(history_model, latent_model)
+        qmodule = self._script_qmodule(
+            self.make_hza_qmodule(history_model, latent_model)
+        )
         return QhzaModel(
             self.env.action_space,
             history_model,
@@ -128,7 +139,7 @@ class ModelFactory(metaclass=abc.ABCMeta):
 
     def make_qza_model(self) -> QzaModel:
         latent_model = self.make_latent_model()
-        qmodule = self.make_za_qmodule(latent_model)
+        qmodule = self._script_qmodule(self.make_za_qmodule(latent_model))
         return QzaModel(self.env.action_space, latent_model, qmodule)
 
     @abc.abstractmethod
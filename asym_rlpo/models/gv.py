@@ -40,10 +40,21 @@ def _check_gv_state_space_keys(space: gym.Space) -> bool:
             raise KeyError(f'space does not contain {key=}')
 
 
+def cnn_memory_format() -> torch.memory_format:
+    config = get_config()
+
+    return (
+        torch.channels_last
+        if config._get('gv_cnn_channels_last', False)
+        else torch.contiguous_format
+    )
+
+
 def make_cnn(channels: int) -> nn.Sequential:
     config = get_config()
 
-    return make_cnn_from_filename(config.gv_cnn, channels)
+    cnn = make_cnn_from_filename(config.gv_cnn, channels)
+    return cnn.to(memory_format=cnn_memory_format())
 
 
 class GV_Model(Model):
@@ -224,6 +235,7 @@ class GV_Grid_CNN_Model(Model):
 
         in_channels = len(channels) * embedding_model.dim
         self.cnn_model = make_cnn(in_channels)
+        self.memory_format = cnn_memory_format()
 
     @cached_property
     def dim(self):
@@ -237,6 +249,7 @@ class GV_Grid_CNN_Model(Model):
         grid = self.embedding_model(grid).flatten(start_dim=-2)
 
         cnn_input = torch.transpose(grid, 1, 3)
+        cnn_input = cnn_input.contiguous(memory_format=self.memory_format)
         cnn_output = self.cnn_model(cnn_input)
         cnn_output = cnn_output.flatten(start_dim=1)
 
@@ -264,6 +277,7 @@ class GV_AgentGrid_CNN_Model(Model):
         # adding one for agent_id_grid
         in_channels = len(channels) * embedding_model.dim + 1
         self.cnn_model = make_cnn(in_channels)
+        self.memory_format = cnn_memory_format()
 
     @cached_property
     def dim(self):
@@ -280,6 +294,7 @@ class GV_AgentGrid_CNN_Model(Model):
         agent_id_grid = agent_id_grid.unsqueeze(-1)
         cnn_input = torch.cat([grid, agent_id_grid], dim=-1)
         cnn_input = torch.transpose(cnn_input, 1, 3)
+        cnn_input = cnn_input.contiguous(memory_format=self.memory_format)
         cnn_output = self.cnn_model(cnn_input)
         cnn_output = cnn_output.flatten(start_dim=1)
 
@@ -2,17 +2,23 @@ from __future__ import annotations
 
 import abc
 import functools
+from collections.abc import Sequence
 from typing import Protocol
 
+import torch
+from torch.utils.checkpoint import checkpoint
+
 from asym_rlpo.data import Episode
 from asym_rlpo.models.history.full import (
     FullHistoryIntegrator,
     compute_full_history_features,
+    compute_full_history_features_batch,
 )
 from asym_rlpo.models.history.integrator import HistoryIntegrator
 from asym_rlpo.models.history.reactive import (
     ReactiveHistoryIntegrator,
     compute_reactive_history_features,
+    compute_reactive_history_features_batch,
 )
 from asym_rlpo.models.interaction import InteractionModel
 from asym_rlpo.models.model import Model
@@ -40,6 +46,26 @@ def make_history_features_function(
     )
 
 
+class BatchHistoryFeaturesFunction(Protocol):
+    def __call__(
+        self,
+        sequence_model: SequenceModel,
+        interaction_features: Sequence[Features],
+    ) -> list[Features]: ...
+
+
+def make_batch_history_features_function(
+    memory_size: int,
+) -> BatchHistoryFeaturesFunction:
+    if memory_size <= 0:
+        return compute_full_history_features_batch
+
+    return functools.partial(
+        compute_reactive_history_features_batch,
+        memory_size=memory_size,
+    )
+
+
 class HistoryModel(metaclass=abc.ABCMeta):
     @property
     @abc.abstractmethod
@@ -50,6 +76,9 @@ class HistoryModel(metaclass=abc.ABCMeta):
     def episodic(self, episode: Episode) -> Features:
         assert False
 
+    def batch_episodic(self, episodes: Sequence[Episode]) -> list[Features]:
+        return [self.episodic(episode) for episode in episodes]
+
     @abc.abstractmethod
     def make_history_integrator(self) -> HistoryIntegrator:
         assert False
@@ -62,13 +91,23 @@ class ConcreteHistoryModel(Model):
         interaction_model: InteractionModel,
         sequence_model: SequenceModel,
         history_features_function: HistoryFeaturesFunction,
+        batch_history_features_function: BatchHistoryFeaturesFunction,
         history_integrator_factory: HistoryIntegratorFactory,
+        *,
+        checkpoint_bptt: bool = False,
     ):
         super().__init__()
         self.interaction_model = interaction_model
         self.sequence_model = sequence_model
         self.history_features_function = history_features_function
+        self.batch_history_features_function = batch_history_features_function
         self.history_integrator_factory = history_integrator_factory
+        self.checkpoint_bptt = checkpoint_bptt
+
+    def _checkpointing(self) -> bool:
+        # NOTE:  activations are only worth discarding when a backward pass
+        # follows, e.g., not for target models evaluated under no_grad
+        return self.checkpoint_bptt and torch.is_grad_enabled()
 
     @property
     def dim(self):
@@ -76,11 +115,34 @@ class ConcreteHistoryModel(Model):
 
     def episodic(self, episode: Episode) -> Features:
         interaction_features = self.interaction_model.episodic(episode)
+        if self._checkpointing():
+            return checkpoint(
+                self.history_features_function,
+                self.sequence_model,
+                interaction_features,
+                use_reentrant=False,
+            )
+
         return self.history_features_function(
             self.sequence_model,
             interaction_features,
         )
 
+    def batch_episodic(self, episodes: Sequence[Episode]) -> list[Features]:
+        interaction_features = self.interaction_model.batch_episodic(episodes)
+        if self._checkpointing():
+            return checkpoint(
+                self.batch_history_features_function,
+                self.sequence_model,
+                interaction_features,
+                use_reentrant=False,
+            )
+
+        return self.batch_history_features_function(
+            self.sequence_model,
+            interaction_features,
+        )
+
     def make_history_integrator(self) -> HistoryIntegrator:
         return self.history_integrator_factory(
             self.interaction_model,
@@ -93,8 +155,12 @@ def make_history_model(
     sequence_model: SequenceModel,
     *,
     memory_size: int,
+    checkpoint_bptt: bool = False,
 ) -> HistoryModel:
     history_features_function = make_history_features_function(memory_size)
+    batch_history_features_function = make_batch_history_features_function(
+        memory_size
+    )
     history_integrator_factory = functools.partial(
         make_history_integrator,
         memory_size=memory_size,
@@ -104,7 +170,9 @@ def make_history_model(
         interaction_model,
         sequence_model,
         history_features_function,
+        batch_history_features_function,
         history_integrator_factory,
+        checkpoint_bptt=checkpoint_bptt,
     )
 
 
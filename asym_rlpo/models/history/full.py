@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from typing import Any
 
 import torch
@@ -20,6 +21,13 @@ def compute_full_history_features(
     return history_features
 
 
+def compute_full_history_features_batch(
+    sequence_model: SequenceModel,
+    interaction_features: Sequence[Features],
+) -> list[Features]:
+    return sequence_model.batch_forward(interaction_features)
+
+
 class FullHistoryIntegrator(HistoryIntegrator):
     def __init__(
         self,
@@ -36,19 +44,19 @@ class FullHistoryIntegrator(HistoryIntegrator):
         interaction_features = self.interaction_model(
             None,
             gtorch.unsqueeze(observation, 0),
-        ).unsqueeze(1)
-        self.__features, self.__hidden = self.sequence_model(interaction_features)
-        self.__features = self.__features.squeeze(0).squeeze(0)
+        ).squeeze(0)
+        self.__features, self.__hidden = self.sequence_model.step(
+            interaction_features
+        )
 
     def step(self, action: torch.Tensor, observation: TorchObservation):
         interaction_features = self.interaction_model(
             action.unsqueeze(0),
             gtorch.unsqueeze(observation, 0),
-        ).unsqueeze(1)
-        self.__features, self.__hidden = self.sequence_model(
+        ).squeeze(0)
+        self.__features, self.__hidden = self.sequence_model.step(
             interaction_features, hidden=self.__hidden
         )
-        self.__features = self.__features.squeeze(0).squeeze(0)
 
     def sample_features(self) -> tuple[Features, dict]:
         info = {}
@@ -1,4 +1,6 @@
+import itertools
 from collections import deque
+from collections.abc import Sequence
 
 import torch
 
@@ -10,28 +12,65 @@ from asym_rlpo.models.sequence import SequenceModel
 from asym_rlpo.types import Features
 
 
-def compute_reactive_history_features(
-    sequence_model: SequenceModel,
+def unfold_interaction_features(
     interaction_features: Features,
     *,
     memory_size: int,
 ) -> Features:
-    if memory_size <= 0:
-        raise ValueError(f'invalid {memory_size=}')
-
+    """returns the (zero-padded) window of the last `memory_size` interactions
+    for each timestep"""
     padding = torch.zeros_like(interaction_features[0].expand(memory_size - 1, -1))
     interaction_features = torch.cat(
         [padding, interaction_features],
         dim=0,
     )
     interaction_features = interaction_features.unfold(0, memory_size, 1)
-    interaction_features = interaction_features.swapaxes(-2, -1)
+    return interaction_features.swapaxes(-2, -1)
+
+
+def compute_reactive_history_features(
+    sequence_model: SequenceModel,
+    interaction_features: Features,
+    *,
+    memory_size: int,
+) -> Features:
+    if memory_size <= 0:
+        raise ValueError(f'invalid {memory_size=}')
+
+    interaction_features = unfold_interaction_features(
+        interaction_features,
+        memory_size=memory_size,
+    )
     history_features, _ = sequence_model(interaction_features)
     history_features = history_features[:, -1]
 
     return history_features
 
 
+def compute_reactive_history_features_batch(
+    sequence_model: SequenceModel,
+    interaction_features: Sequence[Features],
+    *,
+    memory_size: int,
+) -> list[Features]:
+    if memory_size <= 0:
+        raise ValueError(f'invalid {memory_size=}')
+
+    # windows have a fixed size, so all episodes are processed as one batch
+    lengths = [features.size(0) for features in interaction_features]
+    interaction_windows = torch.cat(
+        [
+            unfold_interaction_features(features, memory_size=memory_size)
+            for features in interaction_features
+        ],
+        dim=0,
+    )
+    history_features, _ = sequence_model(interaction_windows)
+    history_features = history_features[:, -1]
+
+    return list(history_features.split(lengths))
+
+
 class ReactiveHistoryIntegrator(HistoryIntegrator):
     def __init__(
         self,
@@ -52,10 +91,11 @@ class ReactiveHistoryIntegrator(HistoryIntegrator):
             gtorch.unsqueeze(observation, 0),
         ).squeeze(0)
 
+        # a single zero tensor is shared by all padding entries
+        padding = interaction_features.new_zeros(interaction_features.size(-1))
         self._interaction_features_deque.clear()
         self._interaction_features_deque.extend(
-            torch.zeros(interaction_features.size(-1))
-            for _ in range(self.memory_size - 1)
+            itertools.repeat(padding, self.memory_size - 1)
         )
 
         self._interaction_features_deque.append(interaction_features)
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import itertools
+from collections.abc import Sequence
+
 import torch
 
+import asym_rlpo.generalized_torch as gtorch
 from asym_rlpo.data import Episode, TorchObservation
 from asym_rlpo.models.model import FeatureModel
 from asym_rlpo.types import Features
@@ -46,11 +50,37 @@ class InteractionModel(FeatureModel):
     def episodic(self, episode: Episode) -> Features:
         """syncs actions and observations, and applies interaction models"""
         action_features = self.action_model(episode.actions)
-        action_features = action_features.roll(1, 0)
-        action_features[0, :] = 0.0
         observation_features = self.observation_model(episode.observations)
 
-        return torch.cat([action_features, observation_features], dim=-1)
+        # NOTE:  shifted action features and observation features are written
+        # directly into a single output tensor, rather than rolled and then
+        # concatenated;  the buffer is allocated per call (not persisted) since
+        # autograd saves it for the backward pass
+        action_dim = action_features.size(-1)
+        features = observation_features.new_empty(len(episode), self.dim)
+        features[0, :action_dim] = 0.0
+        features[1:, :action_dim] = action_features[:-1]
+        features[:, action_dim:] = observation_features
+
+        return features
+
+    def batch_episodic(self, episodes: Sequence[Episode]) -> list[Features]:
+        """applies `episodic` to a batch of episodes, calling each model once"""
+        lengths = [len(episode) for episode in episodes]
+        actions = torch.cat([episode.actions for episode in episodes])
+        observations = gtorch.cat([episode.observations for episode in episodes])
+        action_features = self.action_model(actions)
+        observation_features = self.observation_model(observations)
+
+        action_dim = action_features.size(-1)
+        features = observation_features.new_empty(sum(lengths), self.dim)
+        features[1:, :action_dim] = action_features[:-1]
+        features[:, action_dim:] = observation_features
+        # the first timestep of each episode has no preceding action
+        starts = [0, *itertools.accumulate(lengths[:-1])]
+        features[starts, :action_dim] = 0.0
+
+        return list(features.split(lengths))
 
     def zeros_like(self, device: torch.device | None = None):
         return torch.cat(
@@ -1,6 +1,5 @@
 import gym.spaces
 import torch
-import torch.nn.functional as F
 
 from asym_rlpo.models.model import FeatureModel
 
@@ -21,7 +20,14 @@ class OneHotModel(FeatureModel):
         return self.__num_classes
 
     def forward(self, inputs):
-        return F.one_hot(inputs, num_classes=self.__num_classes).float()
+        # scattering directly into a float tensor avoids materializing an
+        # integer one-hot tensor and then converting it
+        features = torch.zeros(
+            *inputs.shape,
+            self.__num_classes,
+            device=inputs.device,
+        )
+        return features.scatter_(-1, inputs.unsqueeze(-1), 1.0)
 
     def zeros_like(self, device: torch.device | None = None):
         return torch.zeros(self.__num_classes, device=device)
@@ -1,9 +1,11 @@
 import abc
+from collections.abc import Sequence
 
 import gym.spaces
 import torch
 
-from asym_rlpo.data import Episode
+import asym_rlpo.generalized_torch as gtorch
+from asym_rlpo.data import Episode, split_episodes
 from asym_rlpo.models.history import HistoryModel
 from asym_rlpo.models.model import Model
 from asym_rlpo.models.types import QModule
@@ -24,6 +26,9 @@ class QModel(Model):
     def values(self, episode: Episode) -> torch.Tensor:
         assert False
 
+    def batch_values(self, episodes: Sequence[Episode]) -> list[torch.Tensor]:
+        return [self.values(episode) for episode in episodes]
+
 
 class QhaModel(QModel):
     def __init__(
@@ -40,6 +45,11 @@ class QhaModel(QModel):
         history_features = self.history_model.episodic(episode)
         return self.value_module(history_features).squeeze(-1)
 
+    def batch_values(self, episodes: Sequence[Episode]) -> list[torch.Tensor]:
+        history_features = torch.cat(self.history_model.batch_episodic(episodes))
+        values = self.value_module(history_features).squeeze(-1)
+        return split_episodes(values, episodes)
+
     def value_function(self) -> ActionValueFunction:
         return self.value_module
 
@@ -72,6 +82,12 @@ class QzaModel(QModel):
         latent_features = self.latent_model(episode.latents)
         return self.value_module(latent_features).squeeze(-1)
 
+    def batch_values(self, episodes: Sequence[Episode]) -> list[torch.Tensor]:
+        latents = gtorch.cat([episode.latents for episode in episodes])
+        latent_features = self.latent_model(latents)
+        values = self.value_module(latent_features).squeeze(-1)
+        return split_episodes(values, episodes)
+
 
 class QhzaModel(QModel):
     def __init__(
@@ -91,3 +107,11 @@ class QhzaModel(QModel):
         latent_features = self.latent_model(episode.latents)
         input_features = torch.cat([history_features, latent_features], dim=-1)
         return self.value_module(input_features).squeeze(-1)
+
+    def batch_values(self, episodes: Sequence[Episode]) -> list[torch.Tensor]:
+        history_features = torch.cat(self.history_model.batch_episodic(episodes))
+        latents = gtorch.cat([episode.latents for episode in episodes])
+        latent_features = self.latent_model(latents)
+        input_features = torch.cat([history_features, latent_features], dim=-1)
+        values = self.value_module(input_features).squeeze(-1)
+        return split_episodes(values, episodes)
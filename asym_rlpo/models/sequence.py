@@ -1,9 +1,11 @@
 import abc
+from collections.abc import Sequence
 from typing import Generic, TypeAlias, TypeVar
 
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
+from torch.nn.utils.rnn import pack_sequence, pad_packed_sequence, pad_sequence
 
 from asym_rlpo.models.mlp import MLP_Model
 from asym_rlpo.models.model import Model
@@ -22,6 +24,36 @@ class SequenceModel(Model, Generic[HiddenType]):
     ) -> tuple[Features, HiddenType]:
         assert False
 
+    def batch_forward(self, inputs: Sequence[Features]) -> list[Features]:
+        """applies the model to a batch of variable-length sequences"""
+        # right-padding does not affect the outputs of causal models at the
+        # valid timesteps, so the padded outputs are simply truncated
+        lengths = [input.size(0) for input in inputs]
+        output, _ = self(pad_sequence(list(inputs), batch_first=True))
+        return [o[:length] for o, length in zip(output, lengths)]
+
+    def step(
+        self,
+        input: Features,
+        *,
+        hidden: HiddenType | None = None,
+    ) -> tuple[Features, HiddenType]:
+        """applies the model to a single unbatched timestep"""
+        output, hidden = self(input.view(1, 1, -1), hidden=hidden)
+        return output.view(-1), hidden
+
+
+def packed_batch_forward(
+    rnn: nn.RNNBase,
+    inputs: Sequence[Features],
+) -> list[Features]:
+    """applies a recurrent module to a packed batch of variable-length sequences"""
+    lengths = [input.size(0) for input in inputs]
+    packed_input = pack_sequence(list(inputs), enforce_sorted=False)
+    packed_output, _ = rnn(packed_input)
+    output, _ = pad_packed_sequence(packed_output, batch_first=True)
+    return [o[:length] for o, length in zip(output, lengths)]
+
 
 RNN_Hidden: TypeAlias = torch.Tensor
 
@@ -48,10 +80,49 @@ class RNN_SequenceModel(SequenceModel[RNN_Hidden]):
     ) -> tuple[Features, RNN_Hidden]:
         return self.rnn(input, hidden)
 
+    def batch_forward(self, inputs: Sequence[Features]) -> list[Features]:
+        return packed_batch_forward(self.rnn, inputs)
+
+    def step(
+        self,
+        input: Features,
+        *,
+        hidden: RNN_Hidden | None = None,
+    ) -> tuple[Features, RNN_Hidden]:
+        # a single timestep of a single-layer rnn is cheaper as two plain
+        # matrix-vector products than through the fused recurrent kernel
+        h = input.new_zeros(self.dim) if hidden is None else hidden.view(-1)
+        output = F.relu(
+            F.linear(input, self.rnn.weight_ih_l0, self.rnn.bias_ih_l0)
+            + F.linear(h, self.rnn.weight_hh_l0, self.rnn.bias_hh_l0)
+        )
+        return output, output.view(1, 1, -1)
+
 
 GRU_Hidden: TypeAlias = torch.Tensor
 
 
+@torch.jit.script
+def gru_step(
+    input: torch.Tensor,
+    hidden: torch.Tensor,
+    weight_ih: torch.Tensor,
+    bias_ih: torch.Tensor,
+    weight_hh: torch.Tensor,
+    bias_hh: torch.Tensor,
+) -> torch.Tensor:
+    """single timestep of a single-layer gru, on unbatched vectors"""
+    gi = F.linear(input, weight_ih, bias_ih)
+    gh = F.linear(hidden, weight_hh, bias_hh)
+    i_r, i_z, i_n = gi.chunk(3)
+    h_r, h_z, h_n = gh.chunk(3)
+
+    r = torch.sigmoid(i_r + h_r)
+    z = torch.sigmoid(i_z + h_z)
+    n = torch.tanh(i_n + r * h_n)
+    return n + z * (hidden - n)
+
+
 class GRU_SequenceModel(SequenceModel[GRU_Hidden]):
     def __init__(self, in_features: int, out_features: int):
         super().__init__()
@@ -73,6 +144,29 @@ class GRU_SequenceModel(SequenceModel[GRU_Hidden]):
     ) -> tuple[Features, GRU_Hidden]:
         return self.gru(input, hidden)
 
+    def batch_forward(self, inputs: Sequence[Features]) -> list[Features]:
+        return packed_batch_forward(self.gru, inputs)
+
+    def step(
+        self,
+        input: Features,
+        *,
+        hidden: GRU_Hidden | None = None,
+    ) -> tuple[Features, GRU_Hidden]:
+        # a single timestep of a single-layer gru is cheaper as plain
+        # matrix-vector products than through the fused recurrent kernel, and
+        # the scripted step runs them without per-op python dispatch
+        h = input.new_zeros(self.dim) if hidden is None else hidden.view(-1)
+        output = gru_step(
+            input,
+            h,
+            self.gru.weight_ih_l0,
+            self.gru.bias_ih_l0,
+            self.gru.weight_hh_l0,
+            self.gru.bias_hh_l0,
+        )
+        return output, output.view(1, 1, -1)
+
 
 Attention_Hidden: TypeAlias = torch.Tensor
 
@@ -157,6 +251,26 @@ class Stacked_SequenceModel(SequenceModel[Stacked_Hidden]):
 
         return output, new_hidden
 
+    def step(
+        self,
+        input: Features,
+        *,
+        hidden: Stacked_Hidden | None = None,
+    ) -> tuple[Features, Stacked_Hidden]:
+        output = input
+
+        if hidden is None:
+            hidden = tuple(None for _ in range(len(self.models)))
+
+        new_hidden = []
+        for model, h in zip(self.models, hidden):
+            output, h = model.step(output, hidden=h)
+            new_hidden.append(h)
+
+        new_hidden = tuple(new_hidden)
+
+        return output, new_hidden
+
 
 def make_sequence_model(
     name: str,
@@ -41,6 +41,30 @@ def q_estimator_factory(
     raise ValueError('invalid estimator name `{name}`')
 
 
+_discount_matrices: dict[tuple[float, torch.device], torch.Tensor] = {}
+
+
+def discount_matrix(
+    discount: float,
+    size: int,
+    *,
+    device: torch.device,
+) -> torch.Tensor:
+    """upper-triangular matrix with elements `discount ** (j - i)`"""
+
+    # NOTE:  the matrix of a given size is the top-left block of any larger
+    # one, so only the largest matrix is kept and sliced as needed
+    key = (discount, device)
+    matrix = _discount_matrices.get(key)
+    if matrix is None or matrix.size(0) < size:
+        indices = torch.arange(size, device=device)
+        exponents = indices.unsqueeze(0) - indices.unsqueeze(-1)
+        matrix = (discount**exponents).triu()
+        _discount_matrices[key] = matrix
+
+    return matrix[:size, :size]
+
+
 def mc_q_estimator(
     rewards: torch.Tensor,
     values: torch.Tensor,
@@ -50,10 +74,7 @@ def mc_q_estimator(
     if rewards.ndim != 1:
         raise ValueError('`rewards` must have 1 dimension')
 
-    size = rewards.size(-1)
-    indices = torch.arange(size)
-    exponents = indices.unsqueeze(0) - indices.unsqueeze(-1)
-    discounts = (discount**exponents).triu()
+    discounts = discount_matrix(discount, rewards.size(-1), device=rewards.device)
     return discounts @ rewards
 
 
@@ -93,10 +114,8 @@ def tdn_q_estimator(
     if rewards.shape != values.shape:
         raise ValueError('`rewards` and `values` must have the same shape')
 
-    size = rewards.size(-1)
-    indices = torch.arange(size)
-    exponents = indices.unsqueeze(0) - indices.unsqueeze(-1)
-    discounts = (discount**exponents).triu().tril(n - 1)
+    discounts = discount_matrix(discount, rewards.size(-1), device=rewards.device)
+    discounts = discounts.tril(n - 1)
     values = values.roll(-n)
     values[-n:] = 0.0
     return discounts @ rewards + (discount**n) * values
@@ -118,10 +137,11 @@ def tdlambda_q_estimator(
     if rewards.shape != values.shape:
         raise ValueError('`rewards` and `values` must have the same shape')
 
-    size = rewards.size(-1)
-    indices = torch.arange(size)
-    exponents = indices.unsqueeze(0) - indices.unsqueeze(-1)
-    discounts = ((discount * lambda_) ** exponents).triu()
+    discounts = discount_matrix(
+        discount * lambda_,
+        rewards.size(-1),
+        device=rewards.device,
+    )
     values = values.roll(-1)
     values[-1] = 0.0
     return discounts @ (rewards + discount * (1 - lambda_) * values)
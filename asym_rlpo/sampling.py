@@ -1,7 +1,10 @@
+from collections.abc import Sequence
+
 import torch
 
 from asym_rlpo.data import Episode, EpisodeBuilder, Interaction
 from asym_rlpo.envs import Environment
+from asym_rlpo.envs.subproc import SubprocEnvironments
 from asym_rlpo.policies import Policy
 from asym_rlpo.utils.convert import numpy2torch
 
@@ -12,7 +15,7 @@ def sample_episode(
     *,
     render: bool = False,
 ) -> Episode:
-    with torch.no_grad():
+    with torch.inference_mode():
         episode_builder = EpisodeBuilder()
 
         done = False
@@ -58,3 +61,63 @@ def sample_episodes(
     render: bool = False,
 ) -> list[Episode]:
     return [sample_episode(env, policy, render=render) for _ in range(num_episodes)]
+
+
+def sample_episodes_parallel(
+    envs: SubprocEnvironments,
+    policies: Sequence[Policy],
+    *,
+    num_episodes: int,
+) -> list[Episode]:
+    """samples episodes while stepping environments in parallel processes"""
+
+    # NOTE:  each environment has its own policy, i.e., its own history
+    # integrator;  environments are reset as soon as their episode ends
+    episodes: list[Episode] = []
+    episode_builders: dict[int, EpisodeBuilder] = {}
+    observations, latents = {}, {}
+    num_started = 0
+
+    def start_episodes(indices: list[int]):
+        nonlocal num_started
+
+        indices = indices[: num_episodes - num_started]
+        for i, (observation, latent) in zip(indices, envs.reset(indices)):
+            episode_builders[i] = EpisodeBuilder()
+            observations[i], latents[i] = observation, latent
+            policies[i].reset(numpy2torch(observation))
+
+        num_started += len(indices)
+
+    with torch.inference_mode():
+        start_episodes(list(range(envs.num_envs)))
+
+        while episode_builders:
+            actions, infos = {}, {}
+            for i in episode_builders:
+                actions[i], infos[i] = policies[i].sample_action()
+
+            transitions = envs.step(actions)
+
+            done_indices = []
+            for i, (observation, latent, reward, done) in transitions.items():
+                policies[i].step(torch.tensor(actions[i]), numpy2torch(observation))
+                episode_builders[i].append(
+                    Interaction(
+                        observation=observations[i],
+                        latent=latents[i],
+                        action=actions[i],
+                        reward=reward,
+                        info=infos[i],
+                    ),
+                    done,
+                )
+                observations[i], latents[i] = observation, latent
+
+                if done:
+                    episodes.append(episode_builders.pop(i).build())
+                    done_indices.append(i)
+
+            start_episodes(done_indices)
+
+    return episodes
@@ -6,8 +6,10 @@ from asym_rlpo.types import LossDict
 
 
 def average(data: Sequence[torch.Tensor]) -> torch.Tensor:
-    return sum(data, start=torch.tensor(0.0)) / len(data)
+    return torch.stack(list(data)).mean()
 
 
 def average_losses(losses: Sequence[LossDict]) -> LossDict:
-    return {k: average([loss[k] for loss in losses]) for k in losses[0].keys()}
+    keys = losses[0].keys()
+    assert all(loss.keys() == keys for loss in losses)
+    return {k: average([loss[k] for loss in losses]) for k in keys}
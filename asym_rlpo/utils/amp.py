@@ -0,0 +1,23 @@
+import contextlib
+
+import torch
+
+
+def autocast(device: torch.device, amp: str):
+    """autocast context for the given mixed-precision mode"""
+
+    if amp == 'off':
+        return contextlib.nullcontext()
+
+    if amp == 'bf16':
+        return torch.autocast(device.type, dtype=torch.bfloat16)
+
+    if amp == 'fp16':
+        return torch.autocast(device.type, dtype=torch.float16)
+
+    raise ValueError(f'invalid amp mode {amp}')
+
+
+def make_grad_scaler(device: torch.device, amp: str) -> torch.amp.GradScaler | None:
+    """gradient scaler, only required to avoid fp16 gradient underflow"""
+    return torch.amp.GradScaler(device.type) if amp == 'fp16' else None
@@ -1,5 +1,6 @@
 import os
 import pickle
+from concurrent.futures import Future, ThreadPoolExecutor
 
 
 def save_data(filename: str, data):
@@ -14,3 +15,42 @@ def save_data(filename: str, data):
 def load_data(filename: str):
     with open(filename, 'rb') as f:
         return pickle.load(f)
+
+
+def _write_bytes(filename: str, payload: bytes):
+    dirname = os.path.dirname(filename)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+
+    # NOTE:  written to a temporary file and renamed, so that an interrupted
+    # write never leaves a truncated file behind
+    tmp_filename = f'{filename}.tmp'
+    with open(tmp_filename, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_filename, filename)
+
+
+class AsyncDataSaver:
+    """saves data from a background thread, one file at a time"""
+
+    def __init__(self):
+        self.__executor = ThreadPoolExecutor(max_workers=1)
+        self.__future: Future | None = None
+
+    def save(self, filename: str, data):
+        # NOTE:  data is serialized synchronously, since it may be modified as
+        # soon as this method returns;  only the disk write is deferred
+        payload = pickle.dumps(data)
+        self.wait()
+        self.__future = self.__executor.submit(_write_bytes, filename, payload)
+
+    def wait(self):
+        """waits for the pending save, re-raising any of its errors"""
+
+        if self.__future is not None:
+            future, self.__future = self.__future, None
+            future.result()
+
+    def close(self):
+        self.wait()
+        self.__executor.shutdown()
@@ -0,0 +1,17 @@
+import os
+from collections.abc import Callable
+from typing import TypeVar
+
+import torch
+
+F = TypeVar('F', bound=Callable)
+
+
+def compile_enabled() -> bool:
+    """checks whether compilation is enabled via `ASYM_RLPO_COMPILE=1`"""
+    return os.environ.get('ASYM_RLPO_COMPILE', '0') == '1'
+
+
+def maybe_compile(function: F, **kwargs) -> F:
+    """compiles `function` with `torch.compile` if compilation is enabled"""
+    return torch.compile(function, **kwargs) if compile_enabled() else function
@@ -5,32 +5,41 @@ ConfigDict: TypeAlias = dict[str, BasicType]
 
 
 class Config:
+    # values are mirrored into the instance `__dict__`, so that attribute
+    # access resolves without going through `__getattr__`
+    __slots__ = ('_config', '_config_copy', '__dict__')
+
     def __init__(self):
         self._config: ConfigDict = {}
+        self._config_copy: ConfigDict | None = None
 
     def _clear(self):
         self._config.clear()
+        self._config_copy = None
+        self.__dict__.clear()
 
     def _update(self, cd: ConfigDict):
         self._config.update(cd)
+        self._config_copy = None
+        self.__dict__.update(cd)
 
     def _get(self, name: str, default=None) -> Any:
         return self._config.get(name, default)
 
     def _as_dict(self) -> ConfigDict:
-        return self._config.copy()
+        # NOTE:  the copy is shared until the next update, and is not to be
+        # modified by callers
+        if self._config_copy is None:
+            self._config_copy = self._config.copy()
+
+        return self._config_copy
 
     def __getattr__(self, name: str) -> Any:
         return self._config[name]
 
 
-_config: Config | None = None
+_config = Config()
 
 
 def get_config() -> Config:
-    global _config
-
-    if _config is None:
-        _config = Config()
-
     return _config
@@ -0,0 +1,99 @@
+import os
+import sys
+from collections.abc import Iterable, Sequence
+from typing import TypeVar
+
+import torch
+import torch.distributed as dist
+import torch.nn as nn
+
+T = TypeVar('T')
+
+
+def init_distributed(device: torch.device):
+    """initializes the default process group from the `torchrun` environment"""
+
+    if device.type == 'cuda':
+        torch.cuda.set_device(int(os.environ.get('LOCAL_RANK', 0)))
+
+    nccl = device.type == 'cuda' and sys.platform != 'win32'
+    dist.init_process_group('nccl' if nccl else 'gloo')
+
+
+def is_distributed() -> bool:
+    return dist.is_available() and dist.is_initialized()
+
+
+def get_rank() -> int:
+    return dist.get_rank() if is_distributed() else 0
+
+
+def get_world_size() -> int:
+    return dist.get_world_size() if is_distributed() else 1
+
+
+def is_main_process() -> bool:
+    return get_rank() == 0
+
+
+def shard(items: Sequence[T]) -> list[T]:
+    """returns the subset of items assigned to this process"""
+    return list(items[get_rank() :: get_world_size()])
+
+
+def _collective_device() -> torch.device:
+    return (
+        torch.device('cuda', torch.cuda.current_device())
+        if dist.get_backend() == 'nccl'
+        else torch.device('cpu')
+    )
+
+
+def all_ranks(flag: bool) -> bool:
+    """returns whether `flag` holds in every process"""
+
+    if not is_distributed():
+        return flag
+
+    tensor = torch.tensor(int(flag), device=_collective_device())
+    dist.all_reduce(tensor, op=dist.ReduceOp.MIN)
+    return bool(tensor.item())
+
+
+def any_rank(flag: bool) -> bool:
+    """returns whether `flag` holds in any process"""
+    return not all_ranks(not flag)
+
+
+def broadcast_module(module: nn.Module, src: int = 0):
+    """copies the parameters and buffers of process `src` to every process"""
+
+    if not is_distributed():
+        return
+
+    for tensor in module.state_dict().values():
+        dist.broadcast(tensor, src)
+
+
+def all_reduce_gradients(parameters: Iterable[nn.Parameter]):
+    """averages gradients across processes using a single flat all-reduce"""
+
+    if not is_distributed():
+        return
+
+    parameters = [parameter for parameter in parameters if parameter.requires_grad]
+    if not parameters:
+        return
+
+    # missing gradients are reduced as zeros to keep buffer sizes consistent
+    gradients = [
+        torch.zeros_like(parameter) if parameter.grad is None else parameter.grad
+        for parameter in parameters
+    ]
+    flat_gradients = torch.cat([gradient.flatten() for gradient in gradients])
+    dist.all_reduce(flat_gradients)
+    flat_gradients /= get_world_size()
+
+    sizes = [parameter.numel() for parameter in parameters]
+    for parameter, gradient in zip(parameters, flat_gradients.split(sizes)):
+        parameter.grad = gradient.view_as(parameter)
@@ -60,3 +60,29 @@ def returns(rewards: np.ndarray, discount: float) -> np.ndarray:
 
     num_steps = rewards.shape[-1]
     return np.einsum('j,...j->...', discounts(num_steps, discount), rewards)
+
+
+def concatenated_returns(
+    rewards: np.ndarray,
+    lengths: np.ndarray,
+    discount: float,
+) -> np.ndarray:
+    """Return the empirical episodic returns from concatenated rewards.
+
+    :param rewards:  (N,) np.ndarray of rewards of all episodes, concatenated
+    :param lengths:  (B,) np.ndarray of (positive) episode lengths, summing to N
+    :param discount:  discount factor
+    :rtype: (B,) np.ndarray of empirical returns
+    """
+    if rewards.ndim != 1:
+        raise ValueError(f'invalid {rewards.ndim=}')
+
+    if lengths.sum() != rewards.size or (lengths <= 0).any():
+        raise ValueError(f'invalid {lengths=}')
+
+    # timestep of each reward within its own episode
+    offsets = np.cumsum(lengths) - lengths
+    steps = np.arange(rewards.size) - np.repeat(offsets, lengths)
+
+    discounted_rewards = discounts(lengths.max(), discount)[steps] * rewards
+    return np.add.reduceat(discounted_rewards, offsets)
@@ -2,13 +2,15 @@ import abc
 from collections import deque
 from collections.abc import Sequence
 
+import numpy as np
+
 
 class RunningAverage(metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def append(self, value: float):
         assert False
 
-    def extend(self, values: Sequence[float]):
+    def extend(self, values: Sequence[float] | np.ndarray):
         for value in values:
             self.append(value)
 
@@ -26,8 +28,9 @@ class InfiniteRunningAverage(RunningAverage):
         self.cum_value += value
         self.num_values += 1
 
-    def extend(self, values: Sequence[float]):
-        self.cum_value += sum(values)
+    def extend(self, values: Sequence[float] | np.ndarray):
+        # NOTE:  arrays are reduced directly, without converting to a list
+        self.cum_value += float(np.sum(values))
         self.num_values += len(values)
 
     def value(self) -> float:
@@ -41,8 +44,9 @@ class WindowRunningAverage(RunningAverage):
     def append(self, value: float):
         self.values.append(value)
 
-    def extend(self, values: Sequence[float]):
-        self.values.extend(values)
+    def extend(self, values: Sequence[float] | np.ndarray):
+        # only the most recent values are kept
+        self.values.extend(np.asarray(values)[-self.values.maxlen :].tolist())
 
     def value(self) -> float:
         return sum(self.values) / len(self.values)
@@ -2,7 +2,6 @@ import functools
 from collections.abc import Callable, Iterable
 from typing import TypeAlias, TypeVar
 
-import torch
 import torch.nn as nn
 
 T = TypeVar('T', bound=nn.Module)
@@ -19,15 +18,12 @@ def full_target_update(target_model: T, model: T):
 
 
 def polyak_target_update(target_model: T, model: T, tau: float):
-    device = next(target_model.parameters()).device
-    one = torch.ones(1, requires_grad=False, device=device)
-
+    # (1 - tau) * target + tau * model, in a single in-place kernel
     for target_parameter, parameter in zip(
         target_model.parameters(),
         model.parameters(),
     ):
-        target_parameter.data.mul_(1 - tau)
-        target_parameter.data.addcmul_(parameter.data, one, value=tau)
+        target_parameter.data.lerp_(parameter.data, tau)
 
 
 def make_target_update_function(
@@ -1,5 +1,5 @@
 from datetime import timedelta
-from time import time
+from time import monotonic, time
 
 
 class Timer:
@@ -30,3 +30,12 @@ def timestamp_is_future(timestamp: float) -> bool:
 
 def timestamp_is_past(timestamp: float) -> bool:
     return timestamp < time()
+
+
+def monotonic_deadline(timestamp: float) -> float:
+    """converts a wall-clock timestamp into a deadline on the monotonic clock"""
+    return monotonic() + (timestamp - time())
+
+
+def deadline_is_past(deadline: float) -> bool:
+    return deadline < monotonic()
@@ -18,10 +18,11 @@ import yaml
 from gym_gridverse.rng import reset_gv_rng
 
 from asym_rlpo.algorithms import A2C, make_a2c_algorithm
-from asym_rlpo.data import Episode, EpisodesFactory
+from asym_rlpo.data import Episode, EpisodesFactory, EpisodeStager
 from asym_rlpo.data_logging.logger import DataLogger
-from asym_rlpo.data_logging.wandb_logger import WandbLogger
+from asym_rlpo.data_logging.wandb_logger import WandbLogger, gradient_histograms
 from asym_rlpo.envs import Environment, LatentType, make_env
+from asym_rlpo.envs.subproc import SubprocEnvironments
 from asym_rlpo.evaluation import evaluate_episodes
 from asym_rlpo.models import make_model_factory
 from asym_rlpo.models.actor_critic import ActorCriticModel
@@ -33,19 +34,27 @@ from asym_rlpo.runs.xstats import (
     update_xstats_simulation,
     update_xstats_training,
 )
-from asym_rlpo.sampling import sample_episodes
+from asym_rlpo.sampling import sample_episodes, sample_episodes_parallel
 from asym_rlpo.types import GradientNormDict, LossDict
-from asym_rlpo.utils.aggregate import average_losses
+from asym_rlpo.utils.amp import autocast, make_grad_scaler
 from asym_rlpo.utils.argparse import (
     history_model_type,
     int_non_neg,
     int_pos,
     int_pow_2,
 )
-from asym_rlpo.utils.checkpointing import load_data, save_data
+from asym_rlpo.utils.checkpointing import AsyncDataSaver, load_data, save_data
+from asym_rlpo.utils.compile import maybe_compile
 from asym_rlpo.utils.config import get_config
 from asym_rlpo.utils.device import get_device
 from asym_rlpo.utils.dispenser import Dispenser, TimeDispenser
+from asym_rlpo.utils.distributed import (
+    any_rank,
+    broadcast_module,
+    get_rank,
+    init_distributed,
+    is_main_process,
+)
 from asym_rlpo.utils.running_average import (
     InfiniteRunningAverage,
     WindowRunningAverage,
@@ -55,7 +64,7 @@ from asym_rlpo.utils.target_update_functions import (
     TargetUpdater,
     make_target_updater,
 )
-from asym_rlpo.utils.timer import Timer, timestamp_is_past
+from asym_rlpo.utils.timer import Timer, deadline_is_past, monotonic_deadline
 
 logger = logging.getLogger(__name__)
 
@@ -116,6 +125,7 @@ def parse_args():
     parser.add_argument('--max-simulation-timesteps', type=int_pos, default=2_000_000)
     parser.add_argument('--max-episode-timesteps', type=int_pos, default=1_000)
     parser.add_argument('--simulation-num-episodes', type=int_pos, default=1)
+    parser.add_argument('--simulation-num-workers', type=int_non_neg, default=0)
 
     # evaluation
     parser.add_argument('--evaluation', action='store_true')
@@ -157,9 +167,11 @@ def parse_args():
     parser.add_argument('--optim-lr-critic', type=float, default=1e-4)
     parser.add_argument('--optim-eps-critic', type=float, default=1e-4)
     parser.add_argument('--optim-max-norm', type=float, default=float('inf'))
+    parser.add_argument('--amp', choices=['off', 'bf16', 'fp16'], default='off')
 
     # device
     parser.add_argument('--device', default='auto')
+    parser.add_argument('--distributed', action='store_true')
 
     # temporary / development
     parser.add_argument('--hs-features-dim', type=int_non_neg, default=0)
@@ -176,6 +188,7 @@ def parse_args():
     parser.add_argument('--gv-ignore-color-channel', action='store_true')
     parser.add_argument('--gv-ignore-state-channel', action='store_true')
     parser.add_argument('--gv-cnn', default=None)
+    parser.add_argument('--gv-cnn-channels-last', action='store_true')
 
     parser.add_argument(
         '--gv-observation-submodels',
@@ -296,6 +309,10 @@ class Runstate(NamedTuple):
     device: torch.device
     negentropy_schedule: Schedule
     q_estimator: Q_Estimator
+    episode_stager: EpisodeStager | None
+    timeout_deadline: float
+    checkpoint_saver: AsyncDataSaver
+    behavior_envs: SubprocEnvironments | None
 
 
 class CheckpointMetadata(NamedTuple):
@@ -322,12 +339,14 @@ def make_runstate(checkpoint: Checkpoint | None) -> Runstate:
 
     table = str.maketrans({'-': '_'})
     latent_type = LatentType[config.latent_type.upper().translate(table)]
-    env = make_env(
+    env_factory = functools.partial(
+        make_env,
         config.env,
         latent_type=latent_type,
         max_episode_timesteps=config.max_episode_timesteps,
         gv_representation=config.gv_representation,
     )
+    env = env_factory()
 
     def actor_optimizer_factory(
         parameters: Iterable[nn.Parameter],
@@ -362,10 +381,17 @@ def make_runstate(checkpoint: Checkpoint | None) -> Runstate:
 
     device = get_device(config.device)
     algo.models.to(device)
+    algo.trainer.grad_scaler = make_grad_scaler(device, config.amp)
+    episode_stager = EpisodeStager(device) if device.type == 'cuda' else None
+    # episode lengths vary, so shapes are traced as dynamic;  cuda graphs
+    # (i.e., mode='reduce-overhead') would be re-recorded for every batch
+    algo.compute_losses = maybe_compile(algo.compute_losses, dynamic=True)
 
     datalogger = WandbLogger()
 
     timer = Timer()
+    timeout_deadline = monotonic_deadline(config.timeout_timestamp)
+    checkpoint_saver = AsyncDataSaver()
     xstats = XStats()
 
     averages = RunstateAverages(
@@ -393,13 +419,38 @@ def make_runstate(checkpoint: Checkpoint | None) -> Runstate:
 
     policy = algo.actor_critic_model.actor_model.policy()
 
-    episodes_factories = RunstateEpisodesFactories(
-        behavior_factory=functools.partial(
+    if config.simulation_num_workers > 0:
+        # behavior episodes are simulated in worker processes, one policy
+        # (i.e., history integrator) per worker environment
+        behavior_envs = SubprocEnvironments(
+            [env_factory] * config.simulation_num_workers
+        )
+        if config.seed is not None:
+            # worker seeds are spawned from a sequence keyed by process, rather
+            # than offset from `config.seed` like the main environment seeds
+            behavior_envs.seed([config.seed, get_rank()])
+
+        behavior_policies = [
+            algo.actor_critic_model.actor_model.policy()
+            for _ in range(config.simulation_num_workers)
+        ]
+        behavior_factory = functools.partial(
+            sample_episodes_parallel,
+            behavior_envs,
+            behavior_policies,
+            num_episodes=config.simulation_num_episodes,
+        )
+    else:
+        behavior_envs = None
+        behavior_factory = functools.partial(
             sample_episodes,
             env,
             policy,
             num_episodes=config.simulation_num_episodes,
-        ),
+        )
+
+    episodes_factories = RunstateEpisodesFactories(
+        behavior_factory=behavior_factory,
         evaluation_factory=functools.partial(
             sample_episodes,
             env,
@@ -435,6 +486,8 @@ def make_runstate(checkpoint: Checkpoint | None) -> Runstate:
         averages = checkpoint.data.averages
         dispensers = checkpoint.data.dispensers
 
+    broadcast_module(algo.models)
+
     return Runstate(
         # original runstate
         env,
@@ -450,6 +503,10 @@ def make_runstate(checkpoint: Checkpoint | None) -> Runstate:
         device,
         negentropy_schedule,
         q_estimator,
+        episode_stager,
+        timeout_deadline,
+        checkpoint_saver,
+        behavior_envs,
     )
 
 
@@ -475,17 +532,23 @@ def make_checkpoint(runstate: Runstate) -> Checkpoint:
 def save_checkpoint(runstate: Runstate):
     config = get_config()
 
+    if not is_main_process():
+        return
+
     if config.checkpoint_path is None:
         logger.info('no checkpoint path available;  skipping checkpoint')
         return
 
     checkpoint = make_checkpoint(runstate)
-    save_data(config.checkpoint_path, checkpoint)
+    runstate.checkpoint_saver.save(config.checkpoint_path, checkpoint)
 
 
 def save_model(model: ActorCriticModel):
     config = get_config()
 
+    if not is_main_process():
+        return
+
     data = {
         'metadata': {'config': config._as_dict()},
         'data': {'model.state_dict': model.state_dict()},
@@ -499,11 +562,13 @@ def run(runstate: Runstate) -> Runflags:
 
     # TODO somehow integrate reproducibility stuff into the checkpoint
     if config.seed is not None:
-        random.seed(config.seed)
-        np.random.seed(config.seed)
-        torch.manual_seed(config.seed)
-        reset_gv_rng(config.seed)
-        runstate.env.seed(config.seed)
+        # distinct processes simulate distinct episodes
+        seed = config.seed + get_rank()
+        random.seed(seed)
+        np.random.seed(seed)
+        torch.manual_seed(seed)
+        reset_gv_rng(seed)
+        runstate.env.seed(seed)
 
     if config.deterministic:
         torch.use_deterministic_algorithms(True)
@@ -513,22 +578,29 @@ def run(runstate: Runstate) -> Runflags:
 
     setup_interruption_handling(runflags)
 
-    wandb.watch(runstate.algo.actor_critic_model)
-    while True:
-        update_runflags(runstate, runflags)
+    try:
+        while True:
+            update_runflags(runstate, runflags)
+
+            if runflags.stop_run():
+                break
 
-        if runflags.stop_run():
-            break
+            run_epoch(runstate, controlflow)
 
-        run_epoch(runstate, controlflow)
+            if runstate.dispensers.checkpoint.dispense():
+                save_checkpoint(runstate)
 
-        if runstate.dispensers.checkpoint.dispense():
-            save_checkpoint(runstate)
+        save_checkpoint(runstate)
+        # the final checkpoint is written before returning
+        runstate.checkpoint_saver.close()
 
-    save_checkpoint(runstate)
+        if runflags.done and config.save_model:
+            save_model(runstate.algo.actor_critic_model)
 
-    if runflags.done and config.save_model:
-        save_model(runstate.algo.actor_critic_model)
+    finally:
+        # worker processes are stopped even if the run raises
+        if runstate.behavior_envs is not None:
+            runstate.behavior_envs.close()
 
     return runflags
 
@@ -545,10 +617,12 @@ def setup_interruption_handling(runflags: Runflags):
 def update_runflags(runstate: Runstate, runflags: Runflags):
     config = get_config()
 
-    runflags.done = (
+    # processes stop together, since training steps are synchronized
+    runflags.done = any_rank(
         runstate.xstats.simulation_timesteps >= config.max_simulation_timesteps
     )
-    runflags.timeout = timestamp_is_past(config.timeout_timestamp)
+    runflags.timeout = any_rank(deadline_is_past(runstate.timeout_deadline))
+    runflags.interrupt = any_rank(runflags.interrupt)
 
 
 def update_controlflow(runstate: Runstate, controlflow: Controlflow):
@@ -563,7 +637,9 @@ def update_controlflow(runstate: Runstate, controlflow: Controlflow):
     evaluate = runstate.xstats.epoch % config.evaluation_period == 0
 
     controlflow.log_data = log_data
-    controlflow.update_target_parameters = update_target
+    # target models are updated together, since episode lengths (and hence
+    # simulation timesteps) differ across processes
+    controlflow.update_target_parameters = any_rank(update_target)
     controlflow.evaluate = evaluate and config.evaluation
     controlflow.save_modelseq = log_data and config.save_modelseq
 
@@ -626,7 +702,7 @@ def log_evaluation(runstate: Runstate, episodes: Sequence[Episode]):
     config = get_config()
 
     evalstats = evaluate_episodes(episodes, discount=config.evaluation_discount)
-    runstate.averages.target.extend(evalstats.returns.tolist())
+    runstate.averages.target.extend(evalstats.returns)
 
     logger.info(
         '%s - EVALUATE - epoch %d simulation_timestep %d return %.3f',
@@ -664,8 +740,8 @@ def log_simulation(runstate: Runstate, episodes: Sequence[Episode]):
     config = get_config()
 
     evalstats = evaluate_episodes(episodes, discount=config.evaluation_discount)
-    runstate.averages.behavior.extend(evalstats.returns.tolist())
-    runstate.averages.behavior100.extend(evalstats.returns.tolist())
+    runstate.averages.behavior.extend(evalstats.returns)
+    runstate.averages.behavior100.extend(evalstats.returns)
 
     logger.info(
         '%s - BEHAVIOR - epoch %d simulation_timestep %d return %.3f avg100 %.3f',
@@ -700,22 +776,30 @@ def run_training(
 ):
     config = get_config()
 
-    episodes = [episode.torch().to(runstate.device) for episode in episodes]
-    losses = average_losses(
-        [
-            runstate.algo.compute_losses(
-                episode,
-                discount=config.training_discount,
-                q_estimator=runstate.q_estimator,
-            )
-            for episode in episodes
-        ]
-    )
+    episodes = [episode.torch() for episode in episodes]
+    if runstate.episode_stager is not None:
+        # page-locked staging buffers allow asynchronous host-to-device copies
+        episodes = runstate.episode_stager.stage(episodes)
+    else:
+        episodes = [episode.to(runstate.device) for episode in episodes]
+    # in distributed runs, each process computes the losses of the episodes it
+    # simulated itself, and gradients are averaged by the trainer
+    with autocast(runstate.device, config.amp):
+        losses = runstate.algo.compute_losses(
+            episodes,
+            discount=config.training_discount,
+            q_estimator=runstate.q_estimator,
+        )
     negentropy_weight = runstate.negentropy_schedule(
         runstate.xstats.simulation_timesteps
     )
     objectives = {
-        'actor': losses['policy'] + negentropy_weight * losses['negentropy'],
+        # fused scaled addition, i.e., policy + negentropy_weight * negentropy
+        'actor': torch.add(
+            losses['policy'],
+            losses['negentropy'],
+            alpha=negentropy_weight,
+        ),
         'critic': losses['critic'],
     }
     gradient_norms = runstate.algo.trainer.gradient_step(objectives)
@@ -759,6 +843,7 @@ def log_training(runstate: Runstate, training_data: TrainingData):
             **losses_logdata,
             'training/weights/negentropy': training_data.negentropy_weight,
             **gradient_norms_logdata,
+            **gradient_histograms(runstate.algo.actor_critic_model),
         },
         commit=False,
     )
@@ -766,6 +851,10 @@ def log_training(runstate: Runstate, training_data: TrainingData):
 
 def save_modelseq(timestep: int, model: ActorCriticModel):
     config = get_config()
+
+    if not is_main_process():
+        return
+
     data = {
         'metadata': {'config': config._as_dict()},
         'data': {
@@ -859,6 +948,12 @@ def main():
         'config': args,
     }
 
+    if args.distributed:
+        init_distributed(get_device(args.device))
+
+        if not is_main_process():
+            wandb_kwargs['mode'] = 'disabled'
+
     checkpoint: Checkpoint | None
     try:
         checkpoint = load_data(args.checkpoint_path)
@@ -27,7 +27,7 @@ from asym_rlpo.data import (
     populate_episode_buffer,
 )
 from asym_rlpo.data_logging.logger import DataLogger
-from asym_rlpo.data_logging.wandb_logger import WandbLogger
+from asym_rlpo.data_logging.wandb_logger import WandbLogger, gradient_histograms
 from asym_rlpo.envs import Environment, LatentType, make_env
 from asym_rlpo.evaluation import evaluate_episodes
 from asym_rlpo.models import make_model_factory
@@ -41,17 +41,26 @@ from asym_rlpo.runs.xstats import (
 )
 from asym_rlpo.sampling import sample_episode, sample_episodes
 from asym_rlpo.types import GradientNormDict, LossDict
-from asym_rlpo.utils.aggregate import average_losses
 from asym_rlpo.utils.argparse import (
     history_model_type,
     int_non_neg,
     int_pos,
     int_pow_2,
 )
-from asym_rlpo.utils.checkpointing import load_data, save_data
+from asym_rlpo.utils.checkpointing import AsyncDataSaver, load_data, save_data
 from asym_rlpo.utils.config import get_config
 from asym_rlpo.utils.device import get_device
 from asym_rlpo.utils.dispenser import Dispenser, TimeDispenser
+from asym_rlpo.utils.distributed import (
+    all_ranks,
+    any_rank,
+    broadcast_module,
+    get_rank,
+    get_world_size,
+    init_distributed,
+    is_main_process,
+    shard,
+)
 from asym_rlpo.utils.running_average import (
     InfiniteRunningAverage,
     WindowRunningAverage,
@@ -61,7 +70,7 @@ from asym_rlpo.utils.target_update_functions import (
     TargetUpdater,
     make_target_updater,
 )
-from asym_rlpo.utils.timer import Timer, timestamp_is_past
+from asym_rlpo.utils.timer import Timer, deadline_is_past, monotonic_deadline
 
 logger = logging.getLogger(__name__)
 
@@ -142,6 +151,7 @@ def parse_args():
     parser.add_argument(
         '--episode-buffer-prepopulate-timesteps', type=int_pos, default=50_000
     )
+    parser.add_argument('--episode-buffer-on-device', action='store_true')
     # target
     parser.add_argument(
         '--target-update-function', choices=['full', 'polyak'], default='full'
@@ -168,6 +178,13 @@ def parse_args():
 
     # device
     parser.add_argument('--device', default='auto')
+    parser.add_argument('--distributed', action='store_true')
+
+    # compilation
+    parser.add_argument('--jit-mlps', action='store_true')
+
+    # memory
+    parser.add_argument('--checkpoint-bptt', action='store_true')
 
     # temporary / development
     parser.add_argument('--hs-features-dim', type=int_non_neg, default=0)
@@ -184,6 +201,7 @@ def parse_args():
     parser.add_argument('--gv-ignore-color-channel', action='store_true')
     parser.add_argument('--gv-ignore-state-channel', action='store_true')
     parser.add_argument('--gv-cnn', default=None)
+    parser.add_argument('--gv-cnn-channels-last', action='store_true')
 
     parser.add_argument(
         '--gv-observation-submodels',
@@ -312,6 +330,8 @@ class Runstate(NamedTuple):
     episodes_factories: RunstateEpisodesFactories
     device: torch.device
     epsilon_schedule: Schedule
+    timeout_deadline: float
+    checkpoint_saver: AsyncDataSaver
 
 
 class CheckpointMetadata(NamedTuple):
@@ -357,6 +377,8 @@ def make_runstate(checkpoint: Checkpoint | None) -> Runstate:
     model_factory.history_model = config.history_model
     model_factory.attention_num_heads = config._get('attention_num_heads')
     model_factory.history_model_memory_size = config.history_model_memory_size
+    model_factory.jit_mlps = config.jit_mlps
+    model_factory.checkpoint_bptt = config.checkpoint_bptt
 
     algo = make_dqn_algorithm(
         config.algo,
@@ -371,6 +393,8 @@ def make_runstate(checkpoint: Checkpoint | None) -> Runstate:
     datalogger = WandbLogger()
 
     timer = Timer()
+    timeout_deadline = monotonic_deadline(config.timeout_timestamp)
+    checkpoint_saver = AsyncDataSaver()
     xstats = XStats()
 
     averages = RunstateAverages(
@@ -402,7 +426,11 @@ def make_runstate(checkpoint: Checkpoint | None) -> Runstate:
     )
 
     episode_buffer = (
-        EpisodeBuffer(config.episode_buffer_max_timesteps)
+        EpisodeBuffer(
+            config.episode_buffer_max_timesteps,
+            device=device if config.episode_buffer_on_device else None,
+            pin_memory=device.type == 'cuda',
+        )
         if checkpoint is None
         else checkpoint.data.episode_buffer
     )
@@ -449,6 +477,8 @@ def make_runstate(checkpoint: Checkpoint | None) -> Runstate:
         averages = checkpoint.data.averages
         dispensers = checkpoint.data.dispensers
 
+    broadcast_module(algo.models)
+
     return Runstate(
         # original runstate
         env,
@@ -465,6 +495,8 @@ def make_runstate(checkpoint: Checkpoint | None) -> Runstate:
         episodes_factories,
         device,
         epsilon_schedule,
+        timeout_deadline,
+        checkpoint_saver,
     )
 
 
@@ -491,17 +523,23 @@ def make_checkpoint(runstate: Runstate) -> Checkpoint:
 def save_checkpoint(runstate: Runstate):
     config = get_config()
 
+    if not is_main_process():
+        return
+
     if config.checkpoint_path is None:
         logger.info('no check point path available')
         return
 
     checkpoint = make_checkpoint(runstate)
-    save_data(config.checkpoint_path, checkpoint)
+    runstate.checkpoint_saver.save(config.checkpoint_path, checkpoint)
 
 
 def save_model(models):
     config = get_config()
 
+    if not is_main_process():
+        return
+
     data = {
         'metadata': {'config': config._as_dict()},
         'data': {'models.state_dict': models.state_dict()},
@@ -515,11 +553,13 @@ def run(runstate: Runstate) -> Runflags:
 
     # TODO somehow integrate reproducibility stuff into the checkpoint
     if config.seed is not None:
-        random.seed(config.seed)
-        np.random.seed(config.seed)
-        torch.manual_seed(config.seed)
-        reset_gv_rng(config.seed)
-        runstate.env.seed(config.seed)
+        # distinct processes simulate distinct episodes
+        seed = config.seed + get_rank()
+        random.seed(seed)
+        np.random.seed(seed)
+        torch.manual_seed(seed)
+        reset_gv_rng(seed)
+        runstate.env.seed(seed)
 
     if config.deterministic:
         torch.use_deterministic_algorithms(True)
@@ -529,7 +569,6 @@ def run(runstate: Runstate) -> Runflags:
 
     setup_interruption_handling(runflags)
 
-    wandb.watch(runstate.algo.models)
     if runstate.episode_buffer.num_episodes() == 0:
         prepopulate_episode_buffer(runstate)
 
@@ -545,6 +584,8 @@ def run(runstate: Runstate) -> Runflags:
             save_checkpoint(runstate)
 
     save_checkpoint(runstate)
+    # the final checkpoint is written before returning
+    runstate.checkpoint_saver.close()
 
     if runflags.done and config.save_model:
         save_model(runstate.algo.models)
@@ -585,10 +626,12 @@ def prepopulate_episode_buffer(runstate: Runstate):
 def update_runflags(runstate: Runstate, runflags: Runflags):
     config = get_config()
 
-    runflags.done = (
+    # processes stop together, since training steps are synchronized
+    runflags.done = any_rank(
         runstate.xstats.simulation_timesteps >= config.max_simulation_timesteps
     )
-    runflags.timeout = timestamp_is_past(config.timeout_timestamp)
+    runflags.timeout = any_rank(deadline_is_past(runstate.timeout_deadline))
+    runflags.interrupt = any_rank(runflags.interrupt)
 
 
 def update_epoch_controlflow(runstate: Runstate, controlflow: Controlflow):
@@ -603,7 +646,9 @@ def update_epoch_controlflow(runstate: Runstate, controlflow: Controlflow):
     evaluate = runstate.xstats.epoch % config.evaluation_period == 0
 
     controlflow.log_data = log_data
-    controlflow.update_target_parameters = update_target
+    # target models are updated together, since episode lengths (and hence
+    # simulation timesteps) differ across processes
+    controlflow.update_target_parameters = any_rank(update_target)
     controlflow.evaluate = evaluate and config.evaluation
     controlflow.save_modelseq = log_data and config.save_modelseq
 
@@ -611,7 +656,8 @@ def update_epoch_controlflow(runstate: Runstate, controlflow: Controlflow):
 def update_training_controlflow(runstate: Runstate, controlflow: Controlflow):
     config = get_config()
 
-    controlflow.train = (
+    # processes perform the same number of (synchronized) training steps
+    controlflow.train = all_ranks(
         runstate.xstats.training_timesteps
         < (
             runstate.xstats.simulation_timesteps
@@ -652,6 +698,7 @@ def run_epoch(runstate: Runstate, controlflow: Controlflow):
     # TODO probably makes more sense to move this into run_training_step for polyak
     if controlflow.update_target_parameters:
         runstate.target_updater(runstate.algo.target_pairs())
+        runstate.algo.invalidate_targets()
 
     run_training(runstate, controlflow)
 
@@ -682,7 +729,7 @@ def log_evaluation(runstate: Runstate, episodes: Sequence[Episode]):
     config = get_config()
 
     evalstats = evaluate_episodes(episodes, discount=config.evaluation_discount)
-    runstate.averages.target.extend(evalstats.returns.tolist())
+    runstate.averages.target.extend(evalstats.returns)
 
     logger.info(
         '%s - EVALUATE - epoch %d simulation_timestep %d return %.3f',
@@ -723,8 +770,8 @@ def log_simulation(runstate: Runstate, episodes: Sequence[Episode]):
     config = get_config()
 
     evalstats = evaluate_episodes(episodes, discount=config.evaluation_discount)
-    runstate.averages.behavior.extend(evalstats.returns.tolist())
-    runstate.averages.behavior100.extend(evalstats.returns.tolist())
+    runstate.averages.behavior.extend(evalstats.returns)
+    runstate.averages.behavior100.extend(evalstats.returns)
 
     logger.info(
         '%s - BEHAVIOR - epoch %d simulation_timestep %d '
@@ -779,16 +826,21 @@ def run_training_step(runstate: Runstate) -> TrainingData:
     config = get_config()
 
     episodes = runstate.episodes_factories.episode_buffer_factory()
-    episodes = [episode.to(runstate.device) for episode in episodes]
 
-    losses = average_losses(
-        [
-            runstate.algo.compute_losses(
-                episode,
-                discount=config.training_discount,
-            )
-            for episode in episodes
+    # in distributed runs, each process computes the losses of a shard of the
+    # batch, and gradients are averaged by the trainer
+    local_episodes = shard(episodes)
+    if not config.episode_buffer_on_device:
+        # copies from pinned memory are queued asynchronously, and overlap with
+        # the host-side work which precedes the first forward pass
+        local_episodes = [
+            episode.to(runstate.device, non_blocking=True)
+            for episode in local_episodes
         ]
+
+    losses = runstate.algo.compute_losses(
+        local_episodes,
+        discount=config.training_discount,
     )
     gradient_norms = runstate.algo.trainer.gradient_step(losses)
 
@@ -826,13 +878,21 @@ def log_training(runstate: Runstate, training_datas: Sequence[TrainingData]):
         for key in keys
     }
     runstate.datalogger.log(
-        {**losses_logdata, **gradient_norms_logdata},
+        {
+            **losses_logdata,
+            **gradient_norms_logdata,
+            **gradient_histograms(runstate.algo.online_models()),
+        },
         commit=False,
     )
 
 
 def save_modelseq(timestep: int, models: nn.Module):
     config = get_config()
+
+    if not is_main_process():
+        return
+
     data = {
         'metadata': {'config': config._as_dict()},
         'data': {
@@ -915,6 +975,20 @@ def main():
         'config': args,
     }
 
+    if args.distributed:
+        init_distributed(get_device(args.device))
+
+        # NOTE:  gradients are averaged with equal weight per process, which
+        # only matches the single-process gradient when shards are equal
+        if args.training_num_episodes % get_world_size() != 0:
+            raise ValueError(
+                f'{args.training_num_episodes=} must be a multiple of the number'
+                f' of processes {get_world_size()}'
+            )
+
+        if not is_main_process():
+            wandb_kwargs['mode'] = 'disabled'
+
     checkpoint: Checkpoint | None
     try:
         checkpoint = load_data(args.checkpoint_path)
@@ -18,9 +18,9 @@ import yaml
 from gym_gridverse.rng import reset_gv_rng
 
 from asym_rlpo.algorithms import MemoryReactive_A2C, make_mr_a2c_algorithm
-from asym_rlpo.data import Episode, EpisodesFactory
+from asym_rlpo.data import Episode, EpisodesFactory, EpisodeStager
 from asym_rlpo.data_logging.logger import DataLogger
-from asym_rlpo.data_logging.wandb_logger import WandbLogger
+from asym_rlpo.data_logging.wandb_logger import WandbLogger, gradient_histograms
 from asym_rlpo.envs import Environment, LatentType, make_env
 from asym_rlpo.evaluation import evaluate_episodes
 from asym_rlpo.models import make_model_factory
@@ -37,14 +37,14 @@ from asym_rlpo.runs.xstats import (
 )
 from asym_rlpo.sampling import sample_episodes
 from asym_rlpo.types import GradientNormDict, LossDict
-from asym_rlpo.utils.aggregate import average_losses
+from asym_rlpo.utils.amp import autocast, make_grad_scaler
 from asym_rlpo.utils.argparse import (
     history_model_type,
     int_non_neg,
     int_pos,
     int_pow_2,
 )
-from asym_rlpo.utils.checkpointing import load_data, save_data
+from asym_rlpo.utils.checkpointing import AsyncDataSaver, load_data, save_data
 from asym_rlpo.utils.config import get_config
 from asym_rlpo.utils.device import get_device
 from asym_rlpo.utils.dispenser import Dispenser, TimeDispenser
@@ -57,7 +57,7 @@ from asym_rlpo.utils.target_update_functions import (
     TargetUpdater,
     make_target_updater,
 )
-from asym_rlpo.utils.timer import Timer, timestamp_is_past
+from asym_rlpo.utils.timer import Timer, deadline_is_past, monotonic_deadline
 
 logger = logging.getLogger(__name__)
 
@@ -160,6 +160,7 @@ def parse_args():
     parser.add_argument('--optim-lr-critic', type=float, default=1e-4)
     parser.add_argument('--optim-eps-critic', type=float, default=1e-4)
     parser.add_argument('--optim-max-norm', type=float, default=float('inf'))
+    parser.add_argument('--amp', choices=['off', 'bf16', 'fp16'], default='off')
 
     # device
     parser.add_argument('--device', default='auto')
@@ -179,6 +180,7 @@ def parse_args():
     parser.add_argument('--gv-ignore-color-channel', action='store_true')
     parser.add_argument('--gv-ignore-state-channel', action='store_true')
     parser.add_argument('--gv-cnn', default=None)
+    parser.add_argument('--gv-cnn-channels-last', action='store_true')
 
     parser.add_argument(
         '--gv-observation-submodels',
@@ -306,6 +308,9 @@ class Runstate(NamedTuple):
     negentropy_schedule: Schedule
     q_estimator: Q_Estimator
     epsilon_schedule: Schedule
+    episode_stager: EpisodeStager | None
+    timeout_deadline: float
+    checkpoint_saver: AsyncDataSaver
 
 
 class CheckpointMetadata(NamedTuple):
@@ -372,10 +377,14 @@ def make_runstate(checkpoint: Checkpoint | None) -> Runstate:
 
     device = get_device(config.device)
     algo.models.to(device)
+    algo.trainer.grad_scaler = make_grad_scaler(device, config.amp)
+    episode_stager = EpisodeStager(device) if device.type == 'cuda' else None
 
     datalogger = WandbLogger()
 
     timer = Timer()
+    timeout_deadline = monotonic_deadline(config.timeout_timestamp)
+    checkpoint_saver = AsyncDataSaver()
     xstats = XStats()
 
     averages = RunstateAverages(
@@ -472,6 +481,9 @@ def make_runstate(checkpoint: Checkpoint | None) -> Runstate:
         negentropy_schedule,
         q_estimator,
         epsilon_schedule,
+        episode_stager,
+        timeout_deadline,
+        checkpoint_saver,
     )
 
 
@@ -502,7 +514,7 @@ def save_checkpoint(runstate: Runstate):
         return
 
     checkpoint = make_checkpoint(runstate)
-    save_data(config.checkpoint_path, checkpoint)
+    runstate.checkpoint_saver.save(config.checkpoint_path, checkpoint)
 
 
 def save_model(model: MemoryReactive_ActorCriticModel):
@@ -535,7 +547,6 @@ def run(runstate: Runstate) -> Runflags:
 
     setup_interruption_handling(runflags)
 
-    wandb.watch(runstate.algo.actor_critic_model)
     while True:
         update_runflags(runstate, runflags)
 
@@ -548,6 +559,8 @@ def run(runstate: Runstate) -> Runflags:
             save_checkpoint(runstate)
 
     save_checkpoint(runstate)
+    # the final checkpoint is written before returning
+    runstate.checkpoint_saver.close()
 
     if runflags.done and config.save_model:
         save_model(runstate.algo.actor_critic_model)
@@ -570,7 +583,7 @@ def update_runflags(runstate: Runstate, runflags: Runflags):
     runflags.done = (
         runstate.xstats.simulation_timesteps >= config.max_simulation_timesteps
     )
-    runflags.timeout = timestamp_is_past(config.timeout_timestamp)
+    runflags.timeout = deadline_is_past(runstate.timeout_deadline)
 
 
 def update_controlflow(runstate: Runstate, controlflow: Controlflow):
@@ -648,7 +661,7 @@ def log_evaluation(runstate: Runstate, episodes: Sequence[Episode]):
     config = get_config()
 
     evalstats = evaluate_episodes(episodes, discount=config.evaluation_discount)
-    runstate.averages.target.extend(evalstats.returns.tolist())
+    runstate.averages.target.extend(evalstats.returns)
 
     logger.info(
         '%s - EVALUATE - epoch %d simulation_timestep %d return %.3f',
@@ -689,8 +702,8 @@ def log_simulation(runstate: Runstate, episodes: Sequence[Episode]):
     config = get_config()
 
     evalstats = evaluate_episodes(episodes, discount=config.evaluation_discount)
-    runstate.averages.behavior.extend(evalstats.returns.tolist())
-    runstate.averages.behavior100.extend(evalstats.returns.tolist())
+    runstate.averages.behavior.extend(evalstats.returns)
+    runstate.averages.behavior100.extend(evalstats.returns)
 
     logger.info(
         '%s - BEHAVIOR - epoch %d simulation_timestep %d return %.3f avg100 %.3f',
@@ -725,22 +738,28 @@ def run_training(
 ):
     config = get_config()
 
-    episodes = [episode.torch().to(runstate.device) for episode in episodes]
-    losses = average_losses(
-        [
-            runstate.algo.compute_losses(
-                episode,
-                discount=config.training_discount,
-                q_estimator=runstate.q_estimator,
-            )
-            for episode in episodes
-        ]
-    )
+    episodes = [episode.torch() for episode in episodes]
+    if runstate.episode_stager is not None:
+        # page-locked staging buffers allow asynchronous host-to-device copies
+        episodes = runstate.episode_stager.stage(episodes)
+    else:
+        episodes = [episode.to(runstate.device) for episode in episodes]
+    with autocast(runstate.device, config.amp):
+        losses = runstate.algo.compute_losses(
+            episodes,
+            discount=config.training_discount,
+            q_estimator=runstate.q_estimator,
+        )
     negentropy_weight = runstate.negentropy_schedule(
         runstate.xstats.simulation_timesteps
     )
     objectives = {
-        'actor': losses['policy'] + negentropy_weight * losses['negentropy'],
+        # fused scaled addition, i.e., policy + negentropy_weight * negentropy
+        'actor': torch.add(
+            losses['policy'],
+            losses['negentropy'],
+            alpha=negentropy_weight,
+        ),
         'critic': losses['critic'],
     }
     gradient_norms = runstate.algo.trainer.gradient_step(objectives)
@@ -784,6 +803,7 @@ def log_training(runstate: Runstate, training_data: TrainingData):
             **losses_logdata,
             'training/weights/negentropy': training_data.negentropy_weight,
             **gradient_norms_logdata,
+            **gradient_histograms(runstate.algo.actor_critic_model),
         },
         commit=False,
     )
@@ -1,9 +1,11 @@
 import itertools as itt
 
+import pytest
 import torch
 
 from asym_rlpo.envs import LatentType, make_env
 from asym_rlpo.models import make_model_factory
+from asym_rlpo.models.types import CriticType
 from asym_rlpo.policies import RandomPolicy
 from asym_rlpo.sampling import sample_episode
 
@@ -46,3 +48,38 @@ def test_compute_history_features():
     pairs = itt.combinations(history_features.values(), 2)
     for x, y in pairs:
         assert not torch.isclose(x, y).all()
+
+
+@pytest.mark.parametrize('critic_type', [CriticType.H, CriticType.HZ, CriticType.Z])
+def test_batch_actor_critic(critic_type: CriticType):
+    # checks that batched actor-critic outputs match per-episode outputs
+
+    env = make_env(
+        'PO-pos-CartPole-v1',
+        latent_type=LatentType.STATE,
+        max_episode_timesteps=100,
+    )
+    policy = RandomPolicy(env.action_space)
+    episodes = [sample_episode(env, policy).torch() for _ in range(4)]
+
+    model_factory = make_model_factory(env)
+    model_factory.history_model = 'rnn'
+    model_factory.history_model_memory_size = 0
+    actor_model = model_factory.make_actor_model()
+    critic_model = model_factory.make_critic_model(critic_type)
+
+    with torch.no_grad():
+        batch_action_logits = actor_model.batch_action_logits(episodes)
+        batch_values = critic_model.batch_values(episodes)
+
+        for i, episode in enumerate(episodes):
+            assert torch.allclose(
+                batch_action_logits[i],
+                actor_model.action_logits(episode),
+                atol=1e-5,
+            )
+            assert torch.allclose(
+                batch_values[i],
+                critic_model.values(episode),
+                atol=1e-5,
+            )
@@ -1,6 +1,9 @@
+import pickle
+
 import numpy as np
+import torch
 
-from asym_rlpo.data import Episode, EpisodeBuffer
+from asym_rlpo.data import Episode, EpisodeBuffer, EpisodeBuilder, Interaction
 
 
 def make_episode(num_timesteps: int):
@@ -13,6 +16,20 @@ def make_episode(num_timesteps: int):
     )
 
 
+def test_episode_unpickle_without_cache():
+    episode = make_episode(10)
+    episode.cache['key'] = 'value'
+
+    state = episode.__getstate__()
+    del state['cache']  # as pickled before episodes had a cache
+    episode = Episode.__new__(Episode)
+    episode.__setstate__(state)
+    assert episode.cache == {}
+
+    episode = pickle.loads(pickle.dumps(make_episode(10)))
+    assert episode.cache == {}
+
+
 def test_episode_buffer_max_timesteps():
     episode_buffer = EpisodeBuffer(100)
     assert episode_buffer.num_interactions() == 0
@@ -55,3 +72,55 @@ def test_episode_buffer_max_timesteps():
     )
     assert episode_buffer.num_interactions() == 100
     assert episode_buffer.num_episodes() == 2
+
+
+def test_episode_buffer_device():
+    device = torch.device('cpu')
+    episode_buffer = EpisodeBuffer(100, device=device)
+
+    episode_buffer.append_episode(make_episode(10).torch())
+    episode_buffer.append_episodes([make_episode(20).torch()])
+    assert episode_buffer.num_interactions() == 30
+
+    for i in range(episode_buffer.num_episodes()):
+        assert episode_buffer[i].actions.device == device
+        assert episode_buffer[i].rewards.device == device
+
+
+def test_episode_buffer_unpickle_without_device():
+    episode_buffer = EpisodeBuffer(100)
+    state = dict(episode_buffer.__dict__)
+    # as pickled before episode buffers had device settings
+    del state['_EpisodeBuffer__device']
+    del state['_EpisodeBuffer__pin_memory']
+
+    episode_buffer = EpisodeBuffer.__new__(EpisodeBuffer)
+    episode_buffer.__setstate__(state)
+    episode_buffer.append_episode(make_episode(10))
+    assert episode_buffer.num_interactions() == 10
+
+
+def test_episode_builder():
+    episode_builder = EpisodeBuilder()
+    for t in range(5):
+        episode_builder.append(
+            Interaction(
+                observation=np.full(3, t, dtype=np.float64),
+                latent=np.zeros(2),
+                action=t % 2,
+                reward=float(t),
+                info={},
+            ),
+            t == 4,
+        )
+
+    episode = episode_builder.build()
+    assert len(episode) == 5
+    assert episode.observations.shape == (5, 3)
+    assert episode.observations.dtype == np.float32
+    assert episode.rewards.dtype == np.float64
+    np.testing.assert_array_equal(episode.rewards, np.arange(5))
+
+    # floating data is already single precision, hence shared, not copied
+    torch_episode = episode.torch()
+    assert np.shares_memory(torch_episode.observations.numpy(), episode.observations)
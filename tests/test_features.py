@@ -22,7 +22,7 @@ def torch_isclose(x: torch.Tensor, y: torch.Tensor) -> bool:
 
 
 # @pytest.mark.parametrize('history_model', ['rnn', 'attention'])
-@pytest.mark.parametrize('history_model', ['rnn'])
+@pytest.mark.parametrize('history_model', ['rnn', 'gru'])
 def test_full_history_integrator(history_model: str):
     env = make_env(
         'PO-pos-CartPole-v1',
@@ -140,3 +140,28 @@ def test_history_integrators(
             history_features1, history_features2
         )
         assert history_features_close == expected
+
+
+@pytest.mark.parametrize('history_model', ['rnn', 'gru'])
+@pytest.mark.parametrize('memory_size', [0, 4])
+def test_batch_episodic(history_model: str, memory_size: int):
+    env = make_env(
+        'PO-pos-CartPole-v1',
+        latent_type=LatentType.STATE,
+        max_episode_timesteps=100,
+    )
+    policy = RandomPolicy(env.action_space)
+    episodes = [sample_episode(env, policy).torch() for _ in range(4)]
+
+    model_factory = make_model_factory(env)
+    model_factory.history_model = history_model
+    model_factory.history_model_memory_size = memory_size
+    model = model_factory.make_history_model()
+
+    with torch.no_grad():
+        batch_history_features = model.batch_episodic(episodes)
+
+        assert len(batch_history_features) == len(episodes)
+        for episode, history_features in zip(episodes, batch_history_features):
+            assert history_features.shape == (len(episode), 128)
+            assert torch_isclose(history_features, model.episodic(episode))
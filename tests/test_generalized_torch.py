@@ -121,3 +121,23 @@ def test_squeeze(data, dim, expected):
 )
 def test_unsqueeze(data, dim, expected):
     assert_equal(gtorch.unsqueeze(data, dim), expected)
+
+
+@pytest.mark.parametrize(
+    'data,expected',
+    [
+        (
+            [torch.tensor([1, 2]), torch.tensor([3])],
+            torch.tensor([1, 2, 3]),
+        ),
+        (
+            [
+                {'x': torch.tensor([1, 2]), 'y': torch.tensor([4.0, 5.0])},
+                {'x': torch.tensor([3]), 'y': torch.tensor([6.0])},
+            ],
+            {'x': torch.tensor([1, 2, 3]), 'y': torch.tensor([4.0, 5.0, 6.0])},
+        ),
+    ],
+)
+def test_cat(data, expected):
+    assert_equal(gtorch.cat(data), expected)
@@ -0,0 +1,33 @@
+import torch
+
+from asym_rlpo.q_estimators import discount_matrix, mc_q_estimator
+
+
+def test_discount_matrix():
+    discount = 0.9
+    device = torch.device('cpu')
+
+    # larger matrix is computed first, smaller one is sliced from it
+    large = discount_matrix(discount, 5, device=device).clone()
+    small = discount_matrix(discount, 3, device=device)
+
+    assert large.shape == (5, 5)
+    assert small.shape == (3, 3)
+    torch.testing.assert_close(small, large[:3, :3])
+    torch.testing.assert_close(large.diagonal(), torch.ones(5))
+    assert (large.tril(-1) == 0.0).all()
+
+
+def test_mc_q_estimator():
+    discount = 0.9
+    rewards = torch.randn(7)
+    values = torch.randn(7)
+
+    returns = torch.empty(7)
+    ret = 0.0
+    for t in reversed(range(7)):
+        ret = rewards[t] + discount * ret
+        returns[t] = ret
+
+    q_values = mc_q_estimator(rewards, values, discount=discount)
+    torch.testing.assert_close(q_values, returns)
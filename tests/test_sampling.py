@@ -0,0 +1,29 @@
+import functools
+
+from asym_rlpo.envs import LatentType, make_env
+from asym_rlpo.envs.subproc import SubprocEnvironments
+from asym_rlpo.policies import RandomPolicy
+from asym_rlpo.sampling import sample_episodes_parallel
+
+
+def test_sample_episodes_parallel():
+    env_factory = functools.partial(
+        make_env,
+        'PO-pos-CartPole-v1',
+        latent_type=LatentType.STATE,
+        max_episode_timesteps=10,
+    )
+    envs = SubprocEnvironments([env_factory] * 2)
+    envs.seed(0)
+
+    env = env_factory()
+    policies = [RandomPolicy(env.action_space) for _ in range(envs.num_envs)]
+
+    try:
+        episodes = sample_episodes_parallel(envs, policies, num_episodes=5)
+    finally:
+        envs.close()
+
+    assert len(episodes) == 5
+    for episode in episodes:
+        assert 1 <= len(episode) <= 10
@@ -0,0 +1,29 @@
+import pytest
+import torch
+
+from asym_rlpo.utils.aggregate import average, average_losses
+
+
+def test_average():
+    data = [torch.tensor(1.0), torch.tensor(2.0), torch.tensor(6.0)]
+    assert average(data).item() == pytest.approx(3.0)
+
+
+def test_average_losses():
+    losses = [
+        {'a': torch.tensor(1.0), 'b': torch.tensor(0.0)},
+        {'a': torch.tensor(3.0), 'b': torch.tensor(4.0)},
+    ]
+    averaged_losses = average_losses(losses)
+    assert averaged_losses.keys() == {'a', 'b'}
+    assert averaged_losses['a'].item() == pytest.approx(2.0)
+    assert averaged_losses['b'].item() == pytest.approx(2.0)
+
+
+def test_average_losses_keys():
+    losses = [
+        {'a': torch.tensor(1.0)},
+        {'b': torch.tensor(3.0)},
+    ]
+    with pytest.raises(AssertionError):
+        average_losses(losses)
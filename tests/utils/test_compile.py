@@ -0,0 +1,21 @@
+import torch
+
+from asym_rlpo.utils.compile import maybe_compile
+
+
+def function(x: torch.Tensor) -> torch.Tensor:
+    return 2 * x + 1
+
+
+def test_maybe_compile_disabled(monkeypatch):
+    monkeypatch.delenv('ASYM_RLPO_COMPILE', raising=False)
+    assert maybe_compile(function) is function
+
+
+def test_maybe_compile_enabled(monkeypatch):
+    monkeypatch.setenv('ASYM_RLPO_COMPILE', '1')
+    compiled_function = maybe_compile(function, backend='eager', dynamic=True)
+    assert compiled_function is not function
+
+    x = torch.randn(5)
+    torch.testing.assert_close(compiled_function(x), function(x))
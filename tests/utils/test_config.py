@@ -0,0 +1,15 @@
+from asym_rlpo.utils.config import Config
+
+
+def test_config_as_dict():
+    config = Config()
+    config._update({'a': 1})
+
+    config_dict = config._as_dict()
+    assert config_dict == {'a': 1}
+    assert config._as_dict() is config_dict
+
+    config._update({'b': 2})
+    assert config._as_dict() == {'a': 1, 'b': 2}
+    assert config_dict == {'a': 1}
+    assert config.b == 2
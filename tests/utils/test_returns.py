@@ -0,0 +1,17 @@
+import numpy as np
+
+from asym_rlpo.utils.returns import concatenated_returns, returns
+
+
+def test_concatenated_returns():
+    discount = 0.9
+    episode_rewards = [np.random.randn(n) for n in [3, 1, 5]]
+
+    rewards = np.concatenate(episode_rewards)
+    lengths = np.array([len(r) for r in episode_rewards])
+    padded_rewards = np.vstack([np.pad(r, (0, 5 - r.size)) for r in episode_rewards])
+
+    np.testing.assert_allclose(
+        concatenated_returns(rewards, lengths, discount),
+        returns(padded_rewards, discount),
+    )
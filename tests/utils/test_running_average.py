@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+from asym_rlpo.utils.running_average import (
+    InfiniteRunningAverage,
+    WindowRunningAverage,
+)
+
+
+def test_infinite_running_average():
+    average = InfiniteRunningAverage()
+    average.extend(np.array([1.0, 2.0, 3.0]))
+    average.extend([4.0])
+    assert average.value() == pytest.approx(2.5)
+
+
+def test_window_running_average():
+    average = WindowRunningAverage(3)
+    average.extend(np.array([1.0, 2.0, 3.0, 4.0, 5.0]))
+    assert average.value() == pytest.approx(4.0)
+
+    average.extend([9.0])
+    assert average.value() == pytest.approx(6.0)